@@ -4,14 +4,106 @@ Configuration management module
 - Manages global settings with a singleton pattern
 - Supplies defaults and merges runtime overrides
 """
+import copy
+import json
 import os
+import threading
 import yaml
 import logging
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any, Dict
 
+# Prefer libyaml's C parser/emitter when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _YamlLoader, CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader, SafeDumper as _YamlDumper
+
+# python-dotenv is optional
+try:
+    from dotenv import load_dotenv as _load_dotenv
+except ImportError:
+    _load_dotenv = None
+
 log = logging.getLogger("config_loader")
 
+# .env only needs to be read into os.environ once per process
+_dotenv_loaded = False
+
+# Parsed YAML keyed by (absolute path, mtime_ns, size) so re-instantiating Config skips re-parsing
+_PARSED_CACHE: Dict[tuple, Any] = {}
+
+# Default settings (includes all required settings)
+_DEFAULTS = {
+    "server": {
+        "host": "0.0.0.0",
+        "port": 5001
+    },
+    "stt": {
+        "model_size": "medium",
+        "device": "cuda",
+        "language": "ko"
+    },
+    "llm": {
+        "api": "ollama",
+        "base_url": "http://localhost:11434",
+        "model": "qwen2.5:0.5b",
+        "think": False,
+        "keep_alive": "30m",
+        "flash_attention": None,
+        "kv_cache_type": None,
+        "num_ctx": None,
+        "num_parallel": None,
+        "auto_start": True,
+        "start_command": "ollama serve",
+        "startup_timeout": 10.0
+    },
+    "tts": {
+        "voice": "ko-KR-SunHiNeural"
+    },
+    "assistant": {
+        "name": "아이",
+        "personality": "cheerful",
+        "proactive": True,
+        "proactive_interval": 1800
+    },
+    "weather": {
+        "api_key": "",
+        "lat": 37.5665,
+        "lon": 126.9780
+    },
+    "context": {
+        "max_history": 20,
+        "backup_interval": 10,
+        "auto_save": True
+    },
+    "emotion": {
+        "enabled": True,
+        "decay_to_neutral": True,
+        "decay_interval": 300
+    },
+    "logging": {
+        "level": "INFO",
+        "save_to_file": True,
+        "log_dir": "logs"
+    },
+    "connection": {
+        "socket_timeout": 0.5
+    },
+    "queue": {
+        "stt_maxsize": 4,
+        "tts_maxsize": 2,
+        "command_maxsize": 10
+    },
+    "audio": {
+        "max_seconds": 12
+    }
+}
+
+# JSON snapshot of the defaults: json.loads is a cheap C-level deep copy for this primitive-only tree
+_DEFAULTS_JSON = json.dumps(_DEFAULTS)
+
 class Config:
     """
     Configuration manager class
@@ -19,70 +111,26 @@ class Config:
     Environment variables have higher priority
     """
     
-    # Define default settings (includes all required settings)
-    DEFAULT_CONFIG = {
-        "server": {
-            "host": "0.0.0.0",
-            "port": 5001
-        },
-        "stt": {
-            "model_size": "medium",
-            "device": "cuda",
-            "language": "ko"
-        },
-        "llm": {
-            "base_url": "http://localhost:11434",
-            "model": "qwen2.5:0.5b",
-            "think": False,
-            "auto_start": True,
-            "start_command": "ollama serve",
-            "startup_timeout": 10.0
-        },
-        "tts": {
-            "voice": "ko-KR-SunHiNeural"
-        },
-        "assistant": {
-            "name": "아이",
-            "personality": "cheerful",
-            "proactive": True,
-            "proactive_interval": 1800
-        },
-        "weather": {
-            "api_key": "",
-            "lat": 37.5665,
-            "lon": 126.9780
-        },
-        "context": {
-            "max_history": 20,
-            "backup_interval": 10,
-            "auto_save": True
-        },
-        "emotion": {
-            "enabled": True,
-            "decay_to_neutral": True,
-            "decay_interval": 300
-        },
-        "logging": {
-            "level": "INFO",
-            "save_to_file": True,
-            "log_dir": "logs"
-        },
-        "connection": {
-            "socket_timeout": 0.5
-        },
-        "queue": {
-            "stt_maxsize": 4,
-            "tts_maxsize": 2,
-            "command_maxsize": 10
-        },
-        "audio": {
-            "max_seconds": 12
-        }
-    }
+    # Default settings (module-level _DEFAULTS; instances start from a fresh copy)
+    DEFAULT_CONFIG = _DEFAULTS
+    
+    # Environment variable overrides: (variable name, config key path, type)
+    ENV_OVERRIDES = (
+        ("WEATHER_API_KEY", ("weather", "api_key"), str),
+        ("SERVER_PORT", ("server", "port"), int),
+        ("DEVICE", ("stt", "device"), str),
+        ("ASSISTANT_NAME", ("assistant", "name"), str),
+        ("LOG_LEVEL", ("logging", "level"), str),
+    )
     
     def __init__(self, config_file: str = "config.yaml"):
         self.config_file = config_file
-        self.config = self.DEFAULT_CONFIG.copy()
+        # Fresh copy so YAML/env overrides never write into the shared defaults
+        self.config = json.loads(_DEFAULTS_JSON)
+        # Resolved get() lookups keyed by key path (cleared on any write)
+        self._get_cache: Dict[tuple, Any] = {}
+        # Read-only section views served by attribute access (config.server, config.llm, ...)
+        self._section_views: Dict[str, MappingProxyType] = {}
         
         # Load from YAML
         self._load_yaml()
@@ -95,12 +143,17 @@ class Config:
     def _load_yaml(self):
         """Load config.yaml file"""
         try:
-            if Path(self.config_file).exists():
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    yaml_config = yaml.safe_load(f)
-                    if yaml_config:
-                        self._merge_config(self.config, yaml_config)
-                        log.info(f"Loaded config from {self.config_file}")
+            path = Path(self.config_file)
+            if path.exists():
+                st = path.stat()
+                key = (str(path.resolve()), st.st_mtime_ns, st.st_size)
+                if key not in _PARSED_CACHE:
+                    # Hand the whole buffer to the parser instead of streaming it through Python file reads
+                    _PARSED_CACHE[key] = yaml.load(path.read_bytes(), Loader=_YamlLoader)
+                yaml_config = copy.deepcopy(_PARSED_CACHE[key])
+                if yaml_config:
+                    self._merge_config(self.config, yaml_config)
+                    log.info(f"Loaded config from {self.config_file}")
             else:
                 log.warning(f"{self.config_file} not found, using defaults")
         except Exception as e:
@@ -108,56 +161,85 @@ class Config:
     
     def _load_env(self):
         """Load environment variables (supports .env file)"""
+        global _dotenv_loaded
         try:
             # Use python-dotenv if available
-            try:
-                from dotenv import load_dotenv
-                load_dotenv()
+            if _load_dotenv is not None and not _dotenv_loaded:
+                _load_dotenv()
+                _dotenv_loaded = True
                 log.info("Loaded .env file")
-            except ImportError:
-                pass
-            
-            # Environment variable overrides
-            if "WEATHER_API_KEY" in os.environ:
-                self.config["weather"]["api_key"] = os.environ["WEATHER_API_KEY"]
             
-            if "SERVER_PORT" in os.environ:
-                self.config["server"]["port"] = int(os.environ["SERVER_PORT"])
-            
-            if "DEVICE" in os.environ:
-                device = os.environ["DEVICE"]
-                self.config["stt"]["device"] = device
-            
-            if "ASSISTANT_NAME" in os.environ:
-                self.config["assistant"]["name"] = os.environ["ASSISTANT_NAME"]
-            
-            if "LOG_LEVEL" in os.environ:
-                self.config["logging"]["level"] = os.environ["LOG_LEVEL"]
+            # Environment variable overrides (one lookup per variable)
+            environ = os.environ
+            applied = []
+            for name, path, cast in self.ENV_OVERRIDES:
+                value = environ.get(name)
+                if value is not None:
+                    self._set_path(path, cast(value))
+                    applied.append(name)
+            if applied:
+                log.info(f"Environment overrides: {', '.join(applied)}")
                 
         except Exception as e:
             log.error(f"Failed to load environment variables: {e}")
     
+    def _set_path(self, path: tuple, value: Any):
+        """Set a value at a nested key path, creating intermediate sections"""
+        node = self.config
+        for key in path[:-1]:
+            node = node.setdefault(key, {})
+        node[path[-1]] = value
+        self._invalidate()
+    
     def _merge_config(self, base: Dict, override: Dict):
-        """Recursively merge dictionaries"""
-        for key, value in override.items():
-            if key in base and isinstance(base[key], dict) and isinstance(value, dict):
-                self._merge_config(base[key], value)
-            else:
-                base[key] = value
+        """Merge nested dictionaries (explicit stack instead of recursion)"""
+        stack = [(base, override)]
+        while stack:
+            dst, src = stack.pop()
+            for key, value in src.items():
+                if isinstance(value, dict) and isinstance(dst.get(key), dict):
+                    stack.append((dst[key], value))
+                else:
+                    dst[key] = value
+        self._invalidate()
+    
+    def _invalidate(self):
+        """Drop memoized lookups after the config tree changes"""
+        self._get_cache.clear()
+        self._section_views.clear()
     
     def get(self, *keys, default=None) -> Any:
         """
         Get a value using nested keys
         e.g. config.get("server", "port") -> 5001
         """
+        try:
+            return self._get_cache[keys]
+        except KeyError:
+            pass
         value = self.config
         for key in keys:
             if isinstance(value, dict) and key in value:
                 value = value[key]
             else:
                 return default
+        self._get_cache[keys] = value
         return value
     
+    def __getattr__(self, name: str):
+        """
+        Read-only view of a top-level section
+        e.g. config.server["port"] -> 5001
+        """
+        config = self.__dict__.get("config")
+        if config is None or name.startswith("_") or not isinstance(config.get(name), dict):
+            raise AttributeError(name)
+        views = self.__dict__.setdefault("_section_views", {})
+        view = views.get(name)
+        if view is None:
+            view = views[name] = MappingProxyType(config[name])
+        return view
+    
     def get_server_config(self) -> Dict:
         """Return server settings"""
         return self.config.get("server", {})
@@ -199,17 +281,20 @@ class Config:
         file_path = config_file or self.config_file
         try:
             with open(file_path, 'w', encoding='utf-8') as f:
-                yaml.dump(self.config, f, default_flow_style=False, allow_unicode=True)
+                yaml.dump(self.config, f, Dumper=_YamlDumper, default_flow_style=False, allow_unicode=True)
             log.info(f"Configuration saved to {file_path}")
         except Exception as e:
             log.error(f"Failed to save config to {file_path}: {e}")
 
 # Global config instance
 _config = None
+_config_lock = threading.Lock()
 
 def get_config(config_file: str = "config.yaml") -> Config:
-    """Return singleton Config instance"""
+    """Return singleton Config instance (double-checked so concurrent first calls build it once)"""
     global _config
     if _config is None:
-        _config = Config(config_file)
+        with _config_lock:
+            if _config is None:
+                _config = Config(config_file)
     return _config
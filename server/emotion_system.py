@@ -8,12 +8,35 @@
 # 지원 감정: happy, sad, excited, sleepy, angry, neutral
 # 감정 전이: 새 감정 감지 시 자동 전환, 시간 경과 시 neutral로 회귀
 # ============================================================
+import copy
 import logging
 import random
+import re
+from collections import Counter, deque
 from typing import Dict, Tuple
 
 log = logging.getLogger("emotion_system")
 
+
+def _compile_keyword_scan(keywords_by_emotion: Dict[str, list]):
+    """
+    감정 키워드 전체를 한 번에 훑는 정규식과 키워드 → 감정 목록 매핑 생성
+    (같은 키워드가 여러 감정에 속할 수 있음. 예: "답답")
+    """
+    owners = {}
+    for emotion, keywords in keywords_by_emotion.items():
+        for keyword in keywords:
+            owners.setdefault(keyword.casefold(), []).append(emotion)
+    # lookahead로 매칭해 서로 겹치는 위치의 키워드도 빠짐없이 찾는다
+    alternation = "|".join(map(re.escape, sorted(owners, key=len, reverse=True)))
+    # 대소문자 무시는 패턴 쪽에서 처리 (입력 문자열을 매번 lower()로 복사하지 않기 위함)
+    return owners, re.compile(f"(?=({alternation}))", re.IGNORECASE)
+
+
+def _choices_excluding(items: tuple) -> Dict[str, tuple]:
+    """항목별로 자기 자신을 뺀 나머지 후보 튜플"""
+    return {item: tuple(other for other in items if other != item) for item in items}
+
 class EmotionSystem:
     """
     감정 상태 시스템
@@ -21,7 +44,11 @@ class EmotionSystem:
     적절한 LED 색상과 서보 동작을 반환합니다.
     """
     
-    EMOTIONS = ["happy", "sad", "excited", "sleepy", "angry", "neutral"]
+    EMOTIONS = ("happy", "sad", "excited", "sleepy", "angry", "neutral")
+    # 점수 동점일 때 우선순위 (EMOTIONS 순서)
+    _EMOTION_RANK = {emotion: i for i, emotion in enumerate(EMOTIONS)}
+    # 현재 감정을 제외한 랜덤 후보 (get_random_emotion용, 감정별로 미리 계산)
+    _RANDOM_EXCLUDING = _choices_excluding(EMOTIONS)
     
     # 감정별 LED 색상 (RGB 0-255)
     EMOTION_COLORS = {
@@ -62,11 +89,15 @@ class EmotionSystem:
         "angry": ["화", "짜증", "싫", "귀찮", "답답", "속상", "빡", "열받"],
         "neutral": []  # 기본값
     }
+    _KEYWORD_OWNERS, _KEYWORD_RE = _compile_keyword_scan(EMOTION_KEYWORDS)
+    
+    # 감정별 EMOTION 명령 (최초 요청 시 생성 후 재사용)
+    _EMOTION_COMMANDS: Dict[str, Dict] = {}
     
     def __init__(self):
         self.current_emotion = "neutral"
-        self.emotion_history = []  # 최근 감정 기록
         self.max_history = 10
+        self.emotion_history = deque(maxlen=self.max_history)  # 최근 감정 기록 (오래된 것부터 자동 폐기)
     
     def analyze_emotion(self, text: str) -> str:
         """
@@ -76,33 +107,31 @@ class EmotionSystem:
         if not text:
             return self.current_emotion
         
-        text_lower = text.lower()
-        
-        # 각 감정별로 키워드 매칭 점수 계산
-        scores = {emotion: 0 for emotion in self.EMOTIONS}
+        # 한 번의 스캔으로 등장한 키워드 수집
+        hits = {m.casefold() for m in self._KEYWORD_RE.findall(text)}
         
-        for emotion, keywords in self.EMOTION_KEYWORDS.items():
-            for keyword in keywords:
-                if keyword in text_lower:
-                    scores[emotion] += 1
+        # 키워드 없으면 현재 감정 유지 (점진적 변화) - 대부분의 발화는 여기서 끝난다
+        if not hits:
+            return self.current_emotion
         
-        # 가장 높은 점수의 감정 선택
-        max_score = max(scores.values())
-        if max_score > 0:
-            detected_emotion = max(scores, key=scores.get)
-            self._update_emotion(detected_emotion)
-            log.info(f"Emotion detected: {detected_emotion} (from text: {text[:30]}...)")
-            return detected_emotion
+        owners = self._KEYWORD_OWNERS[next(iter(hits))] if len(hits) == 1 else None
+        if owners is not None and len(owners) == 1:
+            # 단서가 하나뿐이면 점수 비교 없이 바로 결정
+            detected_emotion = owners[0]
+        else:
+            # 키워드당 1점씩, 등장한 감정만 집계한 뒤 한 번에 최고점 선택 (동점이면 EMOTIONS 순서)
+            scores = Counter(emotion for keyword in hits for emotion in self._KEYWORD_OWNERS[keyword])
+            rank = self._EMOTION_RANK
+            detected_emotion = max(scores, key=lambda emotion: (scores[emotion], -rank[emotion]))
         
-        # 키워드 없으면 현재 감정 유지 (점진적 변화)
-        return self.current_emotion
+        self._update_emotion(detected_emotion)
+        log.info(f"Emotion detected: {detected_emotion} (from text: {text[:30]}...)")
+        return detected_emotion
     
     def _update_emotion(self, new_emotion: str):
         """감정 상태 업데이트"""
         if new_emotion != self.current_emotion:
             self.emotion_history.append(self.current_emotion)
-            if len(self.emotion_history) > self.max_history:
-                self.emotion_history.pop(0)
             self.current_emotion = new_emotion
     
     def get_led_color(self, emotion: str = None) -> Tuple[int, int, int]:
@@ -131,19 +160,26 @@ class EmotionSystem:
     def get_emotion_command(self, emotion: str = None) -> Dict:
         """
         ESP32로 전송할 감정 표현 명령 생성
-        Returns: JSON command dict
+        Returns: JSON command dict (호출자마다 새 사본 - 수정해도 캐시된 명령에는 영향 없음)
         """
         emotion = emotion or self.current_emotion
+        command = self._EMOTION_COMMANDS.get(emotion)
+        if command is not None:
+            return copy.deepcopy(command)
         
         led_pattern = self.get_led_pattern(emotion)
         servo_action = self.get_servo_action(emotion)
         
-        return {
+        command = {
             "action": "EMOTION",
             "emotion": emotion,
             "led": led_pattern,
             "servo_action": servo_action
         }
+        # 명령은 클래스 상수만으로 결정되므로 알려진 감정은 한 번만 만든다
+        if emotion in self.EMOTIONS:
+            self._EMOTION_COMMANDS[emotion] = copy.deepcopy(command)
+        return command
     
     def set_emotion(self, emotion: str):
         """감정을 수동으로 설정"""
@@ -155,10 +191,8 @@ class EmotionSystem:
     
     def get_random_emotion(self, exclude_current: bool = True) -> str:
         """랜덤 감정 반환 (프로액티브 상호작용용)"""
-        emotions = self.EMOTIONS.copy()
-        if exclude_current and self.current_emotion in emotions:
-            emotions.remove(self.current_emotion)
-        return random.choice(emotions)
+        pool = self._RANDOM_EXCLUDING.get(self.current_emotion, self.EMOTIONS) if exclude_current else self.EMOTIONS
+        return random.choice(pool)
     
     def decay_to_neutral(self, probability: float = 0.1):
         """
@@ -9,14 +9,123 @@
 # 타이머: 메모리 내 관리, check_timers()로 만료 확인
 # 키워드 매칭으로 자연어 요청 감지 (process_info_request)
 # ============================================================
+import heapq
+import itertools
+import io
 import logging
+import re
 import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, Optional, List
 import json
 
+# 네트워크 의존성은 선택 사항 (없으면 해당 기능만 비활성)
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+except ModuleNotFoundError:
+    requests = None
+try:
+    import feedparser
+except ModuleNotFoundError:
+    feedparser = None
+
 log = logging.getLogger("info_services")
 
+# 정보 요청 키워드 그룹 (process_info_request에서 한 번의 정규식 스캔으로 모두 판별)
+_BRIEFING_KEYWORDS = frozenset(("브리핑",))
+_TIME_KEYWORDS = frozenset(("시간", "몇 시", "지금"))
+_ALARM_TIMER_KEYWORDS = frozenset(("알람", "타이머"))
+_DATE_KEYWORDS = frozenset(("날짜", "며칠", "오늘"))
+_WEATHER_KEYWORDS = frozenset(("날씨", "기온", "온도", "비", "눈"))
+_NEWS_KEYWORDS = frozenset(("뉴스", "헤드라인"))  # "뉴스들"은 "뉴스"로 함께 잡힌다
+_TIMER_SET_KEYWORDS = frozenset(("설정", "맞춰", "켜"))
+_TIMER_CHECK_KEYWORDS = frozenset(("확인", "남", "얼마"))
+_TIMER_CANCEL_KEYWORDS = frozenset(("취소", "끄", "중지"))
+_INFO_KEYWORDS = (
+    _BRIEFING_KEYWORDS | _TIME_KEYWORDS | _ALARM_TIMER_KEYWORDS | _DATE_KEYWORDS | {"요일"} | _WEATHER_KEYWORDS
+    | _NEWS_KEYWORDS | _TIMER_SET_KEYWORDS | _TIMER_CHECK_KEYWORDS | _TIMER_CANCEL_KEYWORDS
+)
+# lookahead로 겹치는 위치의 키워드까지 모두 수집 (긴 키워드 우선)
+_INFO_KEYWORD_RE = re.compile(
+    "(?=(" + "|".join(map(re.escape, sorted(_INFO_KEYWORDS, key=len, reverse=True))) + "))"
+)
+
+# 정보 요청 라우팅 표 (위에서부터 첫 번째로 맞는 항목 처리)
+# (모두 하나 이상 등장해야 하는 키워드 그룹들, 등장하면 안 되는 키워드, 처리 메서드 이름, 원문 전달 여부)
+_TIMER_KEYWORDS = frozenset(("타이머",))
+_INFO_ROUTES = (
+    # 브리핑 (시각/날씨/뉴스 묶음) - "오늘 브리핑"이 날짜 요청으로 가지 않도록 맨 앞
+    ((_BRIEFING_KEYWORDS,), frozenset(), "get_briefing", False),
+    ((_TIME_KEYWORDS,), _ALARM_TIMER_KEYWORDS, "get_current_time", False),
+    ((_DATE_KEYWORDS,), frozenset(), "get_current_date", False),
+    ((frozenset(("요일",)),), frozenset(), "get_day_of_week", False),
+    ((_WEATHER_KEYWORDS,), frozenset(), "get_weather", False),
+    ((_NEWS_KEYWORDS,), frozenset(), "get_news_headlines", False),
+    ((_TIMER_KEYWORDS, _TIMER_SET_KEYWORDS), frozenset(), "_set_timer_from_text", True),
+    ((_TIMER_KEYWORDS, _TIMER_CHECK_KEYWORDS), frozenset(), "get_active_timers", False),
+    ((_TIMER_KEYWORDS, _TIMER_CANCEL_KEYWORDS), frozenset(), "cancel_all_timers", False),
+)
+
+# datetime.weekday() 인덱스 순 요일 이름
+_WEEKDAYS_KO = ("월요일", "화요일", "수요일", "목요일", "금요일", "토요일", "일요일")
+
+# 뉴스 RSS에서 보관할 최대 헤드라인 수 (그 이후 항목은 파싱하지 않음)
+_NEWS_MAX_TITLES = 10
+
+# 타이머 시간 표현 (N분 / N초)
+_MINUTES_RE = re.compile(r'(\d+)\s*분')
+_SECONDS_RE = re.compile(r'(\d+)\s*초')
+
+
+class _Timer:
+    """타이머 레코드 (고정 필드 - dict 대신 슬롯 속성으로 보관)"""
+
+    __slots__ = ("id", "label", "end_time", "duration")
+
+    def __init__(self, timer_id: int, label: str, end_time: float, duration: int):
+        self.id = timer_id
+        self.label = label
+        self.end_time = end_time
+        self.duration = duration
+
+    def as_dict(self) -> Dict:
+        record = {name: getattr(self, name) for name in self.__slots__}
+        # 내부 마감은 monotonic 기준이므로 밖으로는 기존처럼 wall-clock epoch로 변환
+        record["end_time"] = time.time() + (self.end_time - time.monotonic())
+        return record
+
+
+class _Alarm:
+    """알람 레코드 (고정 필드 - dict 대신 슬롯 속성으로 보관)"""
+
+    __slots__ = ("id", "label", "time", "hour", "minute")
+
+    def __init__(self, alarm_id: int, label: str, alarm_time: datetime, hour: int, minute: int):
+        self.id = alarm_id
+        self.label = label
+        self.time = alarm_time
+        self.hour = hour
+        self.minute = minute
+
+    def as_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def _parse_rss_titles(content: bytes, limit: int) -> List[str]:
+    """RSS 2.0 본문에서 <item><title>만 스트리밍 파싱으로 추출 (limit개 모이면 중단)"""
+    titles = []
+    for _, elem in ET.iterparse(io.BytesIO(content)):
+        if elem.tag == "item":
+            titles.append((elem.findtext("title") or "").strip())
+            if len(titles) >= limit:
+                break
+            elem.clear()
+    return titles
+
+
 class InfoServices:
     """
     정보 서비스 통합 클래스
@@ -30,51 +139,70 @@ class InfoServices:
         self.weather_api_key = weather_api_key
         self.lat = lat
         self.lon = lon
-        self.timers = []  # List of active timers
-        self.alarms = []  # List of active alarms
+        self.timers = []  # 활성 타이머 min-heap: (end_time, seq, timer), end_time은 time.monotonic() 기준
+        self._timer_seq = itertools.count()  # 같은 만료 시각일 때 등록 순서로 정렬
+        self.alarms: List[_Alarm] = []  # 활성 알람
         
         # 날씨 캐시 (5분마다 갱신)
         self.weather_cache = None
-        self.weather_cache_time = 0
+        self.weather_cache_time = 0.0
         self.weather_cache_ttl = 300  # 5 minutes
+        
+        # 날씨/뉴스 요청이 공유하는 HTTP 세션 (keep-alive로 TCP/TLS 연결 재사용, 최초 사용 시 생성)
+        self._http = None
+        # 브리핑에서 날씨 요청을 뉴스와 동시에 보내는 워커 (스레드는 첫 브리핑 때 생성, close()에서 정리)
+        self._briefing_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="info-briefing")
+        
+        # 뉴스 RSS 조건부 요청용 검증자와 마지막 헤드라인 (304 Not Modified면 재사용)
+        self._news_etag = None
+        self._news_modified = None
+        self._news_titles: List[str] = []
     
     def get_current_time(self) -> Dict:
         """현재 시각 반환"""
         now = datetime.now()
-        weekdays = ["월요일", "화요일", "수요일", "목요일", "금요일", "토요일", "일요일"]
         return {
             "type": "time",
             "datetime": now.strftime("%Y-%m-%d %H:%M"),
-            "weekday": weekdays[now.weekday()],
+            "weekday": _WEEKDAYS_KO[now.weekday()],
         }
 
     def get_current_date(self) -> Dict:
         """현재 날짜 반환"""
         now = datetime.now()
-        weekdays = ["월요일", "화요일", "수요일", "목요일", "금요일", "토요일", "일요일"]
         return {
             "type": "date",
             "date": now.strftime("%Y-%m-%d"),
-            "weekday": weekdays[now.weekday()],
+            "weekday": _WEEKDAYS_KO[now.weekday()],
         }
 
     def get_day_of_week(self) -> Dict:
         """요일 반환"""
-        weekdays = ["월요일", "화요일", "수요일", "목요일", "금요일", "토요일", "일요일"]
-        return {"type": "weekday", "weekday": weekdays[datetime.now().weekday()]}
+        return {"type": "weekday", "weekday": _WEEKDAYS_KO[datetime.now().weekday()]}
+    
+    def _http_session(self):
+        """연결 풀을 가진 requests.Session 반환 (없으면 생성)"""
+        if self._http is None:
+            if requests is None:
+                raise RuntimeError("requests is not installed (pip install requests)")
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=4)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._http = session
+        return self._http
     
     def get_weather(self) -> Optional[Dict]:
         """날씨 정보 반환 (OpenWeatherMap API, lat/lon 사용)"""
         if not self.weather_api_key:
             return None
 
-        now = time.time()
+        # TTL은 monotonic 시계 기준 (시스템 시각 변경에 영향받지 않음)
+        now = time.monotonic()
         if self.weather_cache and (now - self.weather_cache_time) < self.weather_cache_ttl:
             return self.weather_cache
 
         try:
-            import requests
-
             url = "http://api.openweathermap.org/data/2.5/weather"
             params = {
                 "lat": self.lat,
@@ -84,7 +212,7 @@ class InfoServices:
                 "lang": "kr"
             }
 
-            response = requests.get(url, params=params, timeout=5)
+            response = self._http_session().get(url, params=params, timeout=5)
             response.raise_for_status()
             data = response.json()
 
@@ -109,32 +237,61 @@ class InfoServices:
     def get_news_headlines(self, count: int = 3) -> Optional[Dict]:
         """뉴스 헤드라인 반환 (RSS 피드)"""
         try:
-            import feedparser
+            # 이전 응답의 ETag/Last-Modified로 조건부 요청 - 피드가 그대로면 본문 없이 304
+            headers = {}
+            if self._news_titles:
+                if self._news_etag:
+                    headers["If-None-Match"] = self._news_etag
+                if self._news_modified:
+                    headers["If-Modified-Since"] = self._news_modified
 
-            feed = feedparser.parse("https://news.naver.com/main/rss/home.nhn")
-            if not feed.entries:
+            response = self._http_session().get(
+                "https://news.naver.com/main/rss/home.nhn", headers=headers, timeout=5
+            )
+            if response.status_code != 304:
+                response.raise_for_status()
+                # 제목만 필요하므로 ElementTree로 앞부분만 파싱, RSS 2.0이 아니면 feedparser로 폴백
+                try:
+                    titles = _parse_rss_titles(response.content, _NEWS_MAX_TITLES)
+                except ET.ParseError:
+                    titles = []
+                if not titles and feedparser is not None:
+                    feed = feedparser.parse(response.content)
+                    titles = [entry.get("title", "") for entry in feed.entries[:_NEWS_MAX_TITLES]]
+                self._news_titles = titles
+                self._news_etag = response.headers.get("ETag")
+                self._news_modified = response.headers.get("Last-Modified")
+            if not self._news_titles:
                 return None
 
-            headlines = [entry.get("title", "") for entry in feed.entries[:count]]
-            return {"type": "news", "headlines": headlines}
+            return {"type": "news", "headlines": self._news_titles[:count]}
 
         except Exception as e:
             log.error("뉴스 가져오기 실패: %s", e)
             return None
     
+    def get_briefing(self) -> Dict:
+        """시각 + 날씨 + 뉴스 묶음 반환 (날씨/뉴스 요청을 동시에 보내 대기 시간을 합이 아닌 최댓값으로)"""
+        weather_future = self._briefing_pool.submit(self.get_weather)
+        news = self.get_news_headlines()
+        weather = weather_future.result()
+        return {"type": "briefing", "time": self.get_current_time(), "weather": weather, "news": news}
+    
+    def close(self):
+        """브리핑 워커와 HTTP 세션 정리 (서버 종료 시 호출)"""
+        self._briefing_pool.shutdown(wait=False)
+        if self._http is not None:
+            self._http.close()
+            self._http = None
+    
     def set_timer(self, seconds: int, label: str = "") -> Dict:
         """타이머 설정"""
         timer_id = len(self.timers)
-        end_time = time.time() + seconds
+        end_time = time.monotonic() + seconds
 
-        timer = {
-            "id": timer_id,
-            "label": label or f"타이머 {timer_id + 1}",
-            "end_time": end_time,
-            "duration": seconds
-        }
-        self.timers.append(timer)
-        return {"type": "timer_set", "label": timer["label"], "duration_sec": seconds}
+        timer = _Timer(timer_id, label or f"타이머 {timer_id + 1}", end_time, seconds)
+        heapq.heappush(self.timers, (end_time, next(self._timer_seq), timer))
+        return {"type": "timer_set", "label": timer.label, "duration_sec": seconds}
     
     def set_alarm(self, hour: int, minute: int, label: str = "") -> Dict:
         """알람 설정"""
@@ -144,30 +301,24 @@ class InfoServices:
         if alarm_time <= now:
             alarm_time += timedelta(days=1)
 
-        alarm = {
-            "id": alarm_id,
-            "label": label or f"알람 {alarm_id + 1}",
-            "time": alarm_time,
-            "hour": hour,
-            "minute": minute
-        }
+        alarm = _Alarm(alarm_id, label or f"알람 {alarm_id + 1}", alarm_time, hour, minute)
         self.alarms.append(alarm)
-        return {"type": "alarm_set", "label": alarm["label"], "hour": hour, "minute": minute}
+        return {"type": "alarm_set", "label": alarm.label, "hour": hour, "minute": minute}
     
     def check_timers(self) -> List[Dict]:
         """
         타이머 확인 및 만료된 타이머 반환
         Returns: list of expired timers
         """
-        now = time.time()
+        now = time.monotonic()
         expired = []
         
-        for timer in self.timers[:]:
-            if now >= timer["end_time"]:
-                expired.append(timer)
-                self.timers.remove(timer)
+        # 만료 시각 순 heap이므로 맨 앞이 아직 남아 있으면 나머지도 모두 남아 있다
+        while self.timers and self.timers[0][0] <= now:
+            expired.append(heapq.heappop(self.timers)[2])
         
-        return expired
+        # 호출 측에는 기존과 같은 dict 형태로 넘긴다
+        return [timer.as_dict() for timer in expired]
     
     def check_alarms(self) -> List[Dict]:
         """
@@ -176,28 +327,29 @@ class InfoServices:
         """
         now = datetime.now()
         triggered = []
+        pending = []
         
-        for alarm in self.alarms[:]:
-            if now >= alarm["time"]:
-                triggered.append(alarm)
-                # 알람은 한 번만 울리고 제거
-                self.alarms.remove(alarm)
+        # 한 번 훑으며 울릴 알람과 남길 알람으로 나눈다 (알람은 한 번만 울리고 제거)
+        for alarm in self.alarms:
+            (triggered if now >= alarm.time else pending).append(alarm)
+        if triggered:
+            self.alarms = pending
         
-        return triggered
+        return [alarm.as_dict() for alarm in triggered]
     
     def get_active_timers(self) -> Dict:
         """활성 타이머 목록 반환"""
-        now = time.time()
+        now = time.monotonic()
         timers = [
-            {"label": t["label"], "remaining_sec": int(t["end_time"] - now)}
-            for t in self.timers
+            {"label": t.label, "remaining_sec": int(t.end_time - now)}
+            for _, _, t in sorted(self.timers)
         ]
         return {"type": "timers", "timers": timers}
 
     def get_active_alarms(self) -> Dict:
         """활성 알람 목록 반환"""
         alarms = [
-            {"label": a["label"], "hour": a["hour"], "minute": a["minute"]}
+            {"label": a.label, "hour": a.hour, "minute": a.minute}
             for a in self.alarms
         ]
         return {"type": "alarms", "alarms": alarms}
@@ -214,57 +366,37 @@ class InfoServices:
         self.alarms = []
         return {"type": "alarms_cancelled", "count": count}
     
+    def _set_timer_from_text(self, text: str) -> Dict:
+        """"N분 N초" 표현에서 시간을 뽑아 타이머 설정"""
+        minutes = _MINUTES_RE.search(text)
+        seconds = _SECONDS_RE.search(text)
+
+        total_seconds = 0
+        if minutes:
+            total_seconds += int(minutes.group(1)) * 60
+        if seconds:
+            total_seconds += int(seconds.group(1))
+
+        if total_seconds > 0:
+            return self.set_timer(total_seconds)
+        return {"type": "timer_error", "message": "시간을 지정해주세요"}
+
     def process_info_request(self, text: str) -> Optional[Dict]:
         """
         텍스트에서 정보 요청을 감지하고 처리
         Returns: raw data dict or None if not an info request
         """
         text_lower = text.lower()
+        hits = set(_INFO_KEYWORD_RE.findall(text_lower))
+
+        # 대부분의 발화는 정보 요청이 아니다 - 키워드가 하나도 없으면 분기 검사 없이 종료
+        if not hits:
+            return None
 
-        # 시간 관련
-        if any(keyword in text_lower for keyword in ["시간", "몇 시", "지금"]):
-            if "알람" not in text_lower and "타이머" not in text_lower:
-                return self.get_current_time()
-
-        # 날짜 관련
-        if any(keyword in text_lower for keyword in ["날짜", "며칠", "오늘"]):
-            return self.get_current_date()
-
-        # 요일 관련
-        if "요일" in text_lower:
-            return self.get_day_of_week()
-
-        # 날씨 관련
-        if any(keyword in text_lower for keyword in ["날씨", "기온", "온도", "비", "눈"]):
-            return self.get_weather()
-
-        # 뉴스 관련
-        if any(keyword in text_lower for keyword in ["뉴스", "뉴스들", "헤드라인"]):
-            return self.get_news_headlines()
-
-        # 타이머 설정
-        if "타이머" in text_lower and ("설정" in text_lower or "맞춰" in text_lower or "켜" in text_lower):
-            import re
-            minutes = re.search(r'(\d+)\s*분', text_lower)
-            seconds = re.search(r'(\d+)\s*초', text_lower)
-
-            total_seconds = 0
-            if minutes:
-                total_seconds += int(minutes.group(1)) * 60
-            if seconds:
-                total_seconds += int(seconds.group(1))
-
-            if total_seconds > 0:
-                return self.set_timer(total_seconds)
-            else:
-                return {"type": "timer_error", "message": "시간을 지정해주세요"}
-
-        # 타이머 확인
-        if "타이머" in text_lower and any(keyword in text_lower for keyword in ["확인", "남", "얼마"]):
-            return self.get_active_timers()
-
-        # 타이머 취소
-        if "타이머" in text_lower and any(keyword in text_lower for keyword in ["취소", "끄", "중지"]):
-            return self.cancel_all_timers()
+        for required, excluded, handler, takes_text in _INFO_ROUTES:
+            if hits & excluded or not all(hits & group for group in required):
+                continue
+            method = getattr(self, handler)
+            return method(text_lower) if takes_text else method()
 
         return None
@@ -15,8 +15,27 @@ from pathlib import Path
 from typing import List, Dict, Optional
 import re
 
+from src.utils import atomic_write_bytes
+
+try:
+    import orjson  # C 확장 JSON 인코더/디코더 (없으면 표준 json 사용)
+except ModuleNotFoundError:
+    orjson = None
+
 log = logging.getLogger("scheduler")
 
+# 일정 요청 감지용 키워드 (발화마다 실행되므로 alternation 정규식으로 미리 컴파일)
+_SCHEDULE_TOPIC_RE = re.compile("일정|약속|회의|병원|있어|가야")
+_SCHEDULE_WHEN_RE = re.compile("오늘|내일|모레|시")
+_SCHEDULE_QUERY_RE = re.compile("뭐|무엇|확인|알려|있어")
+
+# 일정 파싱용 패턴 (날짜 키워드 → 오프셋 일수 (우선순위 순), 시간 표현, 제목에서 지울 키워드)
+_DATE_OFFSETS = {"오늘": 0, "내일": 1, "모레": 2}
+_DATE_RE = re.compile("|".join(_DATE_OFFSETS))
+_TIME_RE = re.compile(r'(오전|오후)?\s*(\d{1,2})\s*시\s*(\d{1,2}분)?')
+_TITLE_FILLER_RE = re.compile("있어|있다|가야해|가야|해야|일정")
+
+
 class Scheduler:
     """
     일정 및 리마인더 관리 시스템
@@ -32,10 +51,13 @@ class Scheduler:
         """저장된 일정 불러오기"""
         try:
             if self.schedule_file.exists():
-                with open(self.schedule_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.schedules = data.get("schedules", [])
-                    log.info(f"Loaded {len(self.schedules)} schedules")
+                if orjson is not None:
+                    data = orjson.loads(self.schedule_file.read_bytes())
+                else:
+                    with open(self.schedule_file, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                self.schedules = data.get("schedules", [])
+                log.info(f"Loaded {len(self.schedules)} schedules")
             else:
                 log.info("No existing schedule file found")
         except Exception as e:
@@ -49,8 +71,11 @@ class Scheduler:
                 "schedules": self.schedules,
                 "last_updated": datetime.now().isoformat()
             }
-            with open(self.schedule_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            if orjson is not None:
+                payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+            else:
+                payload = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+            atomic_write_bytes(self.schedule_file, payload)
             log.info(f"Saved {len(self.schedules)} schedules")
         except Exception as e:
             log.error(f"Failed to save schedules: {e}")
@@ -92,20 +117,12 @@ class Scheduler:
         자연어에서 일정 추출 및 추가
         예: "내일 오후 3시 회의 있어", "다음주 월요일 10시 병원 가야해"
         """
-        # 날짜 키워드
-        date_keywords = {
-            "오늘": 0,
-            "내일": 1,
-            "모레": 2,
-        }
-        
         # 시간 추출 (오전/오후 N시)
-        time_pattern = r'(오전|오후)?\s*(\d{1,2})\s*시\s*(\d{1,2}분)?'
-        time_match = re.search(time_pattern, text)
+        time_match = _TIME_RE.search(text)
         
-        # 날짜 추출
+        # 날짜 추출 (오늘 > 내일 > 모레 순으로 우선)
         target_date = None
-        for keyword, days in date_keywords.items():
+        for keyword, days in _DATE_OFFSETS.items():
             if keyword in text:
                 target_date = datetime.now() + timedelta(days=days)
                 break
@@ -138,13 +155,9 @@ class Scheduler:
             target_date += timedelta(days=1)
         
         # 제목 추출 (키워드 제거)
-        title = text
-        for keyword in ["있어", "있다", "가야해", "가야", "해야", "일정"]:
-            title = title.replace(keyword, "")
-        title = re.sub(time_pattern, "", title)
-        for keyword in date_keywords.keys():
-            title = title.replace(keyword, "")
-        title = title.strip()
+        title = _TITLE_FILLER_RE.sub("", text)
+        title = _TIME_RE.sub("", title)
+        title = _DATE_RE.sub("", title).strip()
         
         if not title or len(title) < 2:
             title = "새 일정"
@@ -256,12 +269,12 @@ class Scheduler:
         text_lower = text.lower()
         
         # 일정 추가
-        if any(keyword in text_lower for keyword in ["일정", "약속", "회의", "병원", "있어", "가야"]):
-            if any(keyword in text_lower for keyword in ["오늘", "내일", "모레", "시"]):
+        if _SCHEDULE_TOPIC_RE.search(text_lower):
+            if _SCHEDULE_WHEN_RE.search(text_lower):
                 return self.parse_and_add_schedule(text)
         
         # 일정 조회
-        if "일정" in text_lower and any(keyword in text_lower for keyword in ["뭐", "무엇", "확인", "알려", "있어"]):
+        if "일정" in text_lower and _SCHEDULE_QUERY_RE.search(text_lower):
             if "오늘" in text_lower:
                 return self.get_today_schedules()
             else:
@@ -12,6 +12,7 @@ import subprocess
 import shlex
 import urllib.parse
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from queue import Empty
 
 import numpy as np
@@ -91,6 +92,24 @@ def _normalize_start_command(start_command):
     return None
 
 
+def _ollama_server_env(llm_config: dict) -> dict:
+    """Environment for an auto-started `ollama serve` (server-side inference options)."""
+    env = os.environ.copy()
+    flash_attention = llm_config.get("flash_attention")
+    if flash_attention is not None:
+        # fused attention kernel (no materialized NxN scores); also required for KV cache quantization
+        env.setdefault("OLLAMA_FLASH_ATTENTION", "1" if flash_attention else "0")
+    kv_cache_type = llm_config.get("kv_cache_type")
+    if kv_cache_type:
+        # f16 (default) / q8_0 / q4_0 - KV cache quantization, applied by Ollama with flash attention
+        env.setdefault("OLLAMA_KV_CACHE_TYPE", str(kv_cache_type))
+    num_parallel = llm_config.get("num_parallel")
+    if num_parallel:
+        # concurrent requests (user turn + memory refresh) are decoded together in one batch
+        env.setdefault("OLLAMA_NUM_PARALLEL", str(int(num_parallel)))
+    return env
+
+
 def ensure_ollama_running(base_url: str, llm_config: dict):
     log = __import__("logging").getLogger("server")
     if _ollama_health_check(base_url):
@@ -113,6 +132,7 @@ def ensure_ollama_running(base_url: str, llm_config: dict):
             start_command,
             stdout=subprocess.DEVNULL,
             stderr=subprocess.DEVNULL,
+            env=_ollama_server_env(llm_config),
             creationflags=getattr(subprocess, "CREATE_NEW_PROCESS_GROUP", 0),
         )
     except Exception as exc:
@@ -131,6 +151,33 @@ def ensure_ollama_running(base_url: str, llm_config: dict):
     return False
 
 
+def warmup_models(stt_engine: STTEngine, llm_client: LLMClient, agent: AgentMode, llm_config: dict):
+    """
+    STT 모델 로드, LLM 서버 기동/모델 로드, TTS 의존성 준비를 병렬로 수행.
+    모두 I/O(다운로드, 디스크, 네트워크) 위주라 겹쳐서 실행하면 콜드 스타트가 가장 느린 하나로 줄어든다.
+    """
+    log = __import__("logging").getLogger("server")
+
+    def _warmup_llm():
+        if llm_client.api == "ollama":
+            ensure_ollama_running(llm_client.base_url, llm_config)
+        return llm_client.warmup()
+
+    start = time.time()
+    with ThreadPoolExecutor(max_workers=3, thread_name_prefix="warmup") as ex:
+        tasks = {
+            "stt": ex.submit(stt_engine.ensure_model),
+            "llm": ex.submit(_warmup_llm),
+            "tts": ex.submit(agent.warmup_tts),
+        }
+        for name, future in tasks.items():
+            try:
+                future.result()
+            except Exception as exc:
+                log.warning("Warmup failed (%s): %s", name, exc)
+    log.info("Warmup finished in %.2fs", time.time() - start)
+
+
 def handle_connection(conn, addr, stt_engine: STTEngine, config):
     global current_mode, robot_handler, agent_handler
 
@@ -281,85 +328,44 @@ def handle_connection(conn, addr, stt_engine: STTEngine, config):
 
                     log.info("Agent Mode: Processing text: %s", text)
 
+                    # LLM 토큰 스트림을 문장 단위로 끊어 바로 TTS 합성/전송 (생성과 합성을 겹침)
+                    turn = {}
                     llm_start = time.time()
-                    response, intent = agent_handler.generate_response(text)
-                    perf_logger.log_llm(time.time() - llm_start)
+                    first_audio_at = None
+                    sent_chunks = 0
+                    for chunk_bytes in agent_handler.iter_tts_audio(
+                        agent_handler.stream_response(text, turn),
+                        sr=SR,
+                        crossfade_ms=12.0,
+                    ):
+                        # mode_robot 응답은 읽지 않고 바로 전환 (기존 동작 유지)
+                        if turn.get("intent") == "mode_robot":
+                            break
+                        if not chunk_bytes:
+                            continue
+                        sent_chunks += 1
+                        if first_audio_at is None:
+                            first_audio_at = time.time()
+                            log.info("First audio chunk ready in %.2fs", first_audio_at - llm_start)
+                        log.info("Sending audio chunk %d: %d bytes", sent_chunks, len(chunk_bytes))
+                        success = send_audio(conn, chunk_bytes, send_lock)
+                        if not success:
+                            log.error("Failed to send audio chunk %d", sent_chunks)
+                            break
+                    if "first_token_sec" in turn:
+                        log.info("LLM first token in %.2fs", turn["first_token_sec"])
+                    if "llm_sec" in turn:
+                        perf_logger.log_llm(turn["llm_sec"])
 
                     # Intent-based mode switching
-                    if intent == "mode_robot":
+                    if turn.get("intent") == "mode_robot":
                         _handle_mode_switch("robot")
                         continue
-                    if intent == "mode_agent":
-                        pass  # Already in agent mode
-
-                    if response:
-                        log.info("Agent Response: %s", response)
-                        tts_text_chunks = agent_handler.prepare_tts_chunks(response, max_chunks=3)
-                        if not tts_text_chunks:
-                            log.error("TTS text chunks are empty after sanitization")
-                            continue
-                        if len(tts_text_chunks) > 1:
-                            log.info("TTS text split into %d chunks", len(tts_text_chunks))
-
-                        tts_start = time.time()
-                        audio_payloads = []
-                        total_chunks = len(tts_text_chunks)
-                        for idx, tts_text in enumerate(tts_text_chunks, start=1):
-                            trim_pad_ms = 140.0
-                            if total_chunks > 1:
-                                if idx == 1 or idx == total_chunks:
-                                    trim_pad_ms = 80.0
-                                else:
-                                    trim_pad_ms = 40.0
-                            wav_bytes = agent_handler.text_to_audio(
-                                tts_text,
-                                trim_pad_ms=trim_pad_ms,
-                            )
-                            if wav_bytes:
-                                audio_payloads.append(wav_bytes)
-                            else:
-                                log.error(
-                                    "TTS chunk failed (%d/%d): %s",
-                                    idx,
-                                    total_chunks,
-                                    tts_text,
-                                )
-                        perf_logger.log_tts(time.time() - tts_start)
-
-                        if not audio_payloads:
-                            log.error("All TTS chunks failed")
-                            continue
 
-                        audio_payloads = agent_handler.crossfade_audio_boundaries(
-                            audio_payloads,
-                            sr=SR,
-                            crossfade_ms=12.0,
-                        )
-                        audio_payloads = [chunk for chunk in audio_payloads if chunk]
-                        if not audio_payloads:
-                            log.error("Crossfaded TTS audio is empty")
-                            continue
-
-                        if len(audio_payloads) > 1:
-                            log.info(
-                                "Prepared %d TTS chunks with boundary crossfade",
-                                len(audio_payloads),
-                            )
-
-                        total_audio_chunks = len(audio_payloads)
-                        for idx, chunk_bytes in enumerate(audio_payloads, start=1):
-                            log.info(
-                                "Sending audio chunk %d/%d: %d bytes",
-                                idx,
-                                total_audio_chunks,
-                                len(chunk_bytes),
-                            )
-                            success = send_audio(conn, chunk_bytes, send_lock)
-                            if not success:
-                                log.error("Failed to send audio chunk %d/%d", idx, total_audio_chunks)
-                                break
+                    if first_audio_at is not None:
+                        perf_logger.log_tts(time.time() - first_audio_at)
                     else:
-                        log.error("Agent generated empty response")
+                        log.error("All TTS chunks failed")
 
             except Exception as exc:
                 log.exception("Worker error processing sid=%s: %s", sid, exc)
@@ -512,15 +518,19 @@ def main():
 
     # Create a single shared LLM client
     llm_config = config.get_llm_config()
-    ensure_ollama_running(llm_config.get("base_url", "http://localhost:11434"), llm_config)
+    llm_api = llm_config.get("api", "ollama")
     llm_client = LLMClient(
         base_url=llm_config.get("base_url", "http://localhost:11434"),
         model=llm_config.get("model", "qwen2.5:0.5b"),
         default_think=llm_config.get("think", False),
+        keep_alive=llm_config.get("keep_alive"),
+        api=llm_api,
+        num_ctx=llm_config.get("num_ctx"),
     )
     log.info(
-        "LLM Client: %s (%s, default_think=%s)",
+        "LLM Client: %s [%s] (%s, default_think=%s)",
         llm_client.base_url,
+        llm_client.api,
         llm_client.model,
         llm_client.default_think,
     )
@@ -544,6 +554,7 @@ def main():
     )
 
     stt_engine = STTEngine(model_size=model_size, device=device, language=language)
+    warmup_models(stt_engine, llm_client, agent_handler, llm_config)
 
     perf_logger = get_performance_logger()
     signal.signal(signal.SIGINT, lambda *_: perf_logger.print_stats())
@@ -554,7 +565,10 @@ def main():
         handler=lambda conn, addr: handle_connection(conn, addr, stt_engine, config),
     )
     log.info("Server started. Default Mode: %s", current_mode)
-    conn_manager.accept_loop()
+    try:
+        conn_manager.accept_loop()
+    finally:
+        agent_handler.close()
 
 
 if __name__ == "__main__":
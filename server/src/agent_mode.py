@@ -7,10 +7,14 @@
 """
 import asyncio
 import logging
+import queue
 import re
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from pathlib import Path
+from typing import Optional
 
 from emotion_system import EmotionSystem
 from info_services import InfoServices
@@ -22,6 +26,10 @@ from src.intent_parser import parse_intent
 log = logging.getLogger(__name__)
 
 
+class _LastSentence(str):
+    """stream_response가 응답의 마지막 문장임을 표시 (iter_tts_audio의 트림 여백 결정용)"""
+
+
 class AgentMode:
     """에이전트 모드 메인 클래스 - 가정용 AI 어시스턴트 기능 제공"""
     _EMOJI_RE = re.compile(
@@ -40,6 +48,26 @@ class AgentMode:
         flags=re.UNICODE,
     )
     _EMOJI_META_RE = re.compile(r"[\u200d\ufe0e\ufe0f]")
+    # 스트리밍 문장 경계 (종결 부호 + 닫는 따옴표/괄호 + 공백)
+    _SENTENCE_END_RE = re.compile(r"[.?!。！？~]+[\"')\]]*\s+")
+    # 콜리 자기소개 패턴 (응답 앞머리에서만 매칭, 순서대로 적용)
+    _INTRO_RES = (
+        re.compile(r"^(안녕하세요[!,. ]*)?(저는|전|제가)?\s*콜리\s*(입니다|이에요|예요)?[!,. ]*", re.IGNORECASE),
+        re.compile(r"^(제 이름은|내 이름은)\s*콜리\s*(입니다|이에요|예요)?[!,. ]*", re.IGNORECASE),
+    )
+
+    # TTS 코루틴 전용 백그라운드 이벤트 루프 (최초 사용 시 생성)
+    _bg_loop = None
+    _bg_thread = None
+    _bg_loop_lock = threading.Lock()
+    # 동시에 합성을 요청할 TTS 청크 수 상한
+    TTS_PREFETCH_WORKERS = 3
+    # 합성 결과(PCM16) LRU 캐시 한도 - 알림/모드 전환 등 반복 문구 재합성 방지
+    TTS_CACHE_MAX_ENTRIES = 128
+    TTS_CACHE_MAX_BYTES = 10 * 1024 * 1024
+    # TTS 필수 모듈 중 설치되지 않은 목록 (최초 확인 시 한 번만 계산)
+    _TTS_REQUIRED_MODULES = ("numpy", "soundfile", "soxr", "edge_tts")
+    _tts_missing = None
 
     def __init__(
         self,
@@ -58,6 +86,15 @@ class AgentMode:
         self.conversation_history = []
         self.max_history = 20
         self.conversation_count = 0
+        # LLM에 보내는 히스토리 윈도우 시작 인덱스 (prefix 캐시 유지를 위해 단계적으로 이동)
+        self._history_start = 0
+        # 히스토리 변경(사용자 발화 기록, 응답 기록)만 직렬화 - LLM 호출 중에는 잡지 않는다
+        self._turn_lock = threading.Lock()
+
+        # TTS 결과 캐시: (text, voice, trim_pad_ms) -> PCM16LE bytes
+        self._tts_cache = OrderedDict()
+        self._tts_cache_bytes = 0
+        self._tts_cache_lock = threading.Lock()
 
         # 메모리 매니저 (md 파일 기반)
         self.memory = MemoryManager(llm_client)
@@ -68,19 +105,16 @@ class AgentMode:
         self.proactive = ProactiveInteraction(proactive_enabled, proactive_interval)
         self.scheduler = Scheduler()
 
-    def _sanitize_response(self, text: str) -> str:
+    def _sanitize_response(self, text: str, strip_intro: bool = True) -> str:
         """LLM 응답 후처리: 자기소개/이모지 제거 + 공백 정리"""
         cleaned = " ".join((text or "").split()).strip()
         if not cleaned:
             return ""
 
         # 콜리 자기소개 패턴 제거
-        intro_patterns = [
-            r"^(안녕하세요[!,. ]*)?(저는|전|제가)?\s*콜리\s*(입니다|이에요|예요)?[!,. ]*",
-            r"^(제 이름은|내 이름은)\s*콜리\s*(입니다|이에요|예요)?[!,. ]*",
-        ]
-        for pattern in intro_patterns:
-            cleaned = re.sub(pattern, "", cleaned, flags=re.IGNORECASE).strip()
+        if strip_intro:
+            for pattern in self._INTRO_RES:
+                cleaned = pattern.sub("", cleaned).strip()
 
         cleaned = self._EMOJI_RE.sub("", cleaned)
         cleaned = self._EMOJI_META_RE.sub("", cleaned)
@@ -169,38 +203,9 @@ class AgentMode:
         청크 경계 클릭 노이즈를 줄이기 위해 짧은 crossfade를 적용한다.
         """
         valid_chunks = [chunk for chunk in audio_chunks if chunk]
-        if not valid_chunks:
-            return b""
         if len(valid_chunks) == 1:
             return valid_chunks[0]
-
-        import numpy as np
-
-        arrays = []
-        for chunk in valid_chunks:
-            if len(chunk) < 2:
-                continue
-            arrays.append(np.frombuffer(chunk, dtype="<i2").astype(np.float32))
-        if not arrays:
-            return b""
-
-        fade_len = max(0, int(sr * max(0.0, float(crossfade_ms)) / 1000.0))
-        merged = arrays[0]
-        for nxt in arrays[1:]:
-            if merged.size == 0:
-                merged = nxt
-                continue
-            n = min(fade_len, merged.size, nxt.size)
-            if n > 0:
-                fade_out = np.linspace(1.0, 0.0, n, dtype=np.float32)
-                fade_in = 1.0 - fade_out
-                overlap = merged[-n:] * fade_out + nxt[:n] * fade_in
-                merged = np.concatenate((merged[:-n], overlap, nxt[n:]))
-            else:
-                merged = np.concatenate((merged, nxt))
-
-        pcm16 = np.clip(merged, -32768.0, 32767.0).astype("<i2")
-        return pcm16.tobytes()
+        return b"".join(AgentMode.iter_crossfaded(valid_chunks, sr=sr, crossfade_ms=crossfade_ms))
 
     @staticmethod
     def crossfade_audio_boundaries(
@@ -215,50 +220,243 @@ class AgentMode:
         valid_chunks = [chunk for chunk in audio_chunks if chunk]
         if len(valid_chunks) <= 1:
             return valid_chunks
+        return list(AgentMode.iter_crossfaded(valid_chunks, sr=sr, crossfade_ms=crossfade_ms))
 
+    @staticmethod
+    def iter_crossfaded(audio_chunks, sr: int = 16000, crossfade_ms: float = 12.0):
+        """
+        PCM16LE 청크 이터러블에 경계 crossfade를 적용하며 순서대로 yield.
+        각 청크는 다음 청크가 도착하는 즉시 내보내므로, 입력이 생성되는 동안에도 전송을 시작할 수 있다.
+        """
         import numpy as np
 
-        arrays = []
-        for chunk in valid_chunks:
-            if len(chunk) < 2:
-                arrays.append(np.zeros(0, dtype=np.float32))
-                continue
-            arrays.append(np.frombuffer(chunk, dtype="<i2").astype(np.float32))
-
         n = max(0, int(sr * max(0.0, float(crossfade_ms)) / 1000.0))
-        if n <= 0:
-            return valid_chunks
+        prev = None
+        for chunk in audio_chunks:
+            if not chunk:
+                continue
+            if n <= 0:
+                yield chunk
+                continue
 
-        out_arrays = []
-        prev = arrays[0]
-        for nxt in arrays[1:]:
-            if prev.size == 0:
-                out_arrays.append(prev)
+            if len(chunk) < 2:
+                nxt = np.zeros(0, dtype=np.float32)
+            else:
+                nxt = np.frombuffer(chunk, dtype="<i2").astype(np.float32)
+            if prev is None:
                 prev = nxt
                 continue
+
             overlap = min(n, prev.size, nxt.size)
             if overlap > 0:
                 fade_out = np.linspace(1.0, 0.0, overlap, dtype=np.float32)
                 fade_in = 1.0 - fade_out
-                mixed = prev[-overlap:] * fade_out + nxt[:overlap] * fade_in
-                prev = np.concatenate((prev[:-overlap], mixed))
+                # 이전 청크 꼬리 위에서 바로 섞어 전체 배열 재할당(concatenate)을 피한다
+                tail = prev[-overlap:]
+                tail *= fade_out
+                tail += nxt[:overlap] * fade_in
                 nxt = nxt[overlap:]
-            out_arrays.append(prev)
+            yield AgentMode._f32_to_pcm16_bytes(prev)
             prev = nxt
-        out_arrays.append(prev)
 
-        result = []
-        for arr in out_arrays:
-            if arr.size == 0:
-                result.append(b"")
-                continue
-            pcm16 = np.clip(arr, -32768.0, 32767.0).astype("<i2")
-            result.append(pcm16.tobytes())
-        return result
+        if prev is not None:
+            yield AgentMode._f32_to_pcm16_bytes(prev)
+
+    @staticmethod
+    def _f32_to_pcm16_bytes(arr) -> bytes:
+        """
+        int16 스케일 float 배열 → PCM16LE 바이트 (빈 배열은 b"").
+        saturate는 입력 버퍼 위에서 in-place로 처리한다 (입력 배열은 clip된 값으로 덮어써진다).
+        """
+        import numpy as np
+
+        if arr.size == 0:
+            return b""
+        np.clip(arr, -32768.0, 32767.0, out=arr)
+        return arr.astype("<i2").tobytes()
+
+    def iter_tts_audio(self, text_chunks, sr: int = 16000, crossfade_ms: float = 12.0):
+        """
+        텍스트 청크를 순서대로 TTS 합성하고, 경계 crossfade를 적용한 PCM16LE 청크를 yield.
+        text_chunks는 리스트 또는 stream_response()처럼 점진적으로 생성되는 iterable.
+        청크가 도착하는 즉시 합성을 요청하고 준비된 순서대로 내보내
+        첫 오디오 전송까지의 지연을 줄인다. 실패한 청크는 건너뛴다.
+        """
+        total_chunks = len(text_chunks) if hasattr(text_chunks, "__len__") else None
+        if total_chunks == 0:
+            return
+
+        def _trim_pad(idx: int, is_last: bool) -> float:
+            if idx == 1 and is_last:
+                return 140.0
+            if idx == 1 or is_last:
+                return 80.0
+            return 40.0
+
+        # 청크들을 동시에 합성 요청 (edge-tts 호출은 공용 백그라운드 루프에서 겹쳐 실행됨)
+        executor = ThreadPoolExecutor(
+            max_workers=self.TTS_PREFETCH_WORKERS,
+            thread_name_prefix="agent-tts",
+        )
+        pending = queue.Queue()
+        stop = threading.Event()
+
+        def _feed():
+            # 텍스트 스트림(LLM 생성)은 별도 스레드에서 소비해 합성/전송과 겹치게 한다.
+            try:
+                for idx, tts_text in enumerate(text_chunks, start=1):
+                    if stop.is_set():
+                        break
+                    # 길이를 모르는 스트림은 stream_response가 마지막 문장을 _LastSentence로 표시한다
+                    if total_chunks is not None:
+                        is_last = idx == total_chunks
+                    else:
+                        is_last = isinstance(tts_text, _LastSentence)
+                    tts_text = str(tts_text)
+                    fut = executor.submit(self.text_to_audio, tts_text, trim_pad_ms=_trim_pad(idx, is_last))
+                    pending.put((idx, tts_text, fut))
+            except Exception as exc:
+                if not stop.is_set():
+                    log.error("TTS text stream failed: %s", exc, exc_info=True)
+            finally:
+                pending.put(None)
+
+        def _synthesize():
+            while True:
+                item = pending.get()
+                if item is None:
+                    return
+                idx, tts_text, fut = item
+                wav_bytes = fut.result()
+                if not wav_bytes:
+                    log.error("TTS chunk failed (%d/%s): %s", idx, total_chunks or "?", tts_text)
+                yield wav_bytes
+
+        threading.Thread(target=_feed, name="agent-tts-feed", daemon=True).start()
+        try:
+            yield from self.iter_crossfaded(_synthesize(), sr=sr, crossfade_ms=crossfade_ms)
+        finally:
+            stop.set()
+            while True:
+                try:
+                    item = pending.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not None:
+                    item[2].cancel()
+            executor.shutdown(wait=False)
 
     def _get_system_prompt(self) -> str:
-        """시스템 프롬프트 생성 - MemoryManager가 md 파일에서 조립"""
-        return self.memory.build_system_prompt()
+        """시스템 프롬프트 생성 - MemoryManager가 md 파일에서 조립 (시각 제외, 턴 간 고정)"""
+        return self.memory.build_system_prompt(include_time=False)
+
+    def _history_window(self) -> list:
+        """
+        LLM에 보낼 최근 대화 윈도우.
+        매 턴 한 칸씩 밀리는 슬라이딩 윈도우는 프롬프트 앞부분을 매번 바꿔
+        LLM 서버의 prefix(KV) 캐시를 무효화한다. 윈도우가 max_history를 넘을 때만
+        절반 크기로 한 번에 잘라내어, 그 사이 턴들은 동일한 prefix를 공유하게 한다.
+        """
+        history = self.conversation_history
+        if len(history) - self._history_start > self.max_history:
+            start = len(history) - self.max_history // 2
+            while start < len(history) - 1 and history[start]["role"] != "user":
+                start += 1
+            self._history_start = start
+        return history[self._history_start:]
+
+    def _trim_history(self):
+        """
+        대화 기록 상한 유지. 한도를 넘으면 앞부분을 한 번에 절반 가까이 잘라 상각 O(1)로 유지하고,
+        LLM 윈도우(_history_start 이후)와 메모리 추출용 최근 20개는 남긴다.
+        잘라낸 대화는 MemoryManager.archive()로 디스크 로그에 추가된다.
+        """
+        history = self.conversation_history
+        cap = max(self.max_history, 20) * 2
+        if len(history) <= cap:
+            return
+        drop = min(len(history) - cap // 2, self._history_start)
+        if drop > 0:
+            # 잘라낸 원문은 메모리 디렉토리의 대화 로그로 보관
+            self.memory.archive(history[:drop])
+            del history[:drop]
+            self._history_start -= drop
+
+    def _build_messages(self, info_context: Optional[str] = None) -> list[dict]:
+        """
+        LLM 메시지 조립.
+        고정 시스템 프롬프트 + 대화 기록을 앞에 두고, 매 턴 바뀌는 값(현재 시각, 참고 데이터)은
+        맨 뒤 시스템 메시지로 분리해 앞부분의 prefix 캐시가 재사용되도록 한다.
+        """
+        messages = [{"role": "system", "content": self._get_system_prompt()}]
+        for conv in self._history_window():
+            messages.append({"role": conv["role"], "content": conv["content"]})
+
+        context = f"현재 시각: {self.memory.current_time_text()}"
+        if info_context:
+            context += f"\n\n[참고 데이터]\n{info_context}\n위 데이터를 바탕으로 자연스럽게 답변하세요."
+        messages.append({"role": "system", "content": context})
+        return messages
+
+    def _begin_turn(self, text: str, is_proactive: bool = False) -> list[dict]:
+        """사용자 발화를 히스토리에 기록하고 LLM 요청 메시지를 구성"""
+        if not is_proactive:
+            self.proactive.update_interaction()
+
+        # 정보 서비스 요청 처리 (날씨, 뉴스 등) → LLM 컨텍스트로 주입
+        info_context = None
+        if not is_proactive:
+            info_data = self.info_services.process_info_request(text)
+            if info_data:
+                import json
+                info_context = json.dumps(info_data, ensure_ascii=False)
+                log.info("Info data for LLM context: %s", info_context)
+
+            schedule_response = self.scheduler.process_schedule_request(text)
+            if schedule_response:
+                info_context = schedule_response if isinstance(schedule_response, str) else str(schedule_response)
+
+        detected_emotion = self.emotion_system.analyze_emotion(text)
+
+        self.conversation_history.append(
+            {
+                "role": "user",
+                "content": text,
+                # epoch ns 정수 (사람이 읽을 때만 datetime.fromtimestamp(ts / 1e9)로 변환)
+                "timestamp": time.time_ns(),
+                "emotion": detected_emotion,
+            }
+        )
+        return self._build_messages(info_context)
+
+    def _finish_turn(self, raw: str) -> tuple[str, str]:
+        """LLM 원문에서 intent/응답을 정리하고 히스토리·메모리에 반영"""
+        intent, clean_text = parse_intent(raw)
+        response = self._sanitize_response(clean_text)
+        if not response:
+            response = "음, 잘 못 알아들었어요. 다시 한번 말씀해주시겠어요?"
+
+        # sleep 의도 처리
+        if intent == "sleep":
+            self.proactive.sleep_mode = True
+            self.proactive.sleep_until = datetime.now().replace(hour=8, minute=0, second=0, microsecond=0)
+
+        response_emotion = self.emotion_system.analyze_emotion(response)
+        self.conversation_history.append(
+            {
+                "role": "assistant",
+                "content": response,
+                "timestamp": time.time_ns(),
+                "emotion": response_emotion,
+            }
+        )
+
+        self.conversation_count += 1
+        self._trim_history()
+        self.memory.after_turn(self.conversation_history)
+
+        log.info("Agent Response (intent=%s): %s", intent, response)
+        return response, intent
 
     def generate_response(self, text: str, is_proactive: bool = False) -> tuple[str, str]:
         """응답 생성. Returns (response_text, intent)."""
@@ -266,92 +464,266 @@ class AgentMode:
             return "모델이 로드되지 않았습니다.", "none"
 
         try:
-            if not is_proactive:
-                self.proactive.update_interaction()
-
-            # 정보 서비스 요청 처리 (날씨, 뉴스 등) → LLM 컨텍스트로 주입
-            info_context = None
-            if not is_proactive:
-                info_data = self.info_services.process_info_request(text)
-                if info_data:
-                    import json
-                    info_context = json.dumps(info_data, ensure_ascii=False)
-                    log.info("Info data for LLM context: %s", info_context)
-
-                schedule_response = self.scheduler.process_schedule_request(text)
-                if schedule_response:
-                    info_context = schedule_response if isinstance(schedule_response, str) else str(schedule_response)
-
-            detected_emotion = self.emotion_system.analyze_emotion(text)
-
-            self.conversation_history.append(
-                {
-                    "role": "user",
-                    "content": text,
-                    "timestamp": datetime.now().isoformat(),
-                    "emotion": detected_emotion,
-                }
-            )
-
-            # LLM 응답 생성
-            system_prompt = self._get_system_prompt()
-            if info_context:
-                system_prompt += f"\n\n[참고 데이터]\n{info_context}\n위 데이터를 바탕으로 자연스럽게 답변하세요."
-            messages = [{"role": "system", "content": system_prompt}]
-            for conv in self.conversation_history[-self.max_history:]:
-                messages.append({"role": conv["role"], "content": conv["content"]})
-
+            # LLM 응답 생성 (잠금은 히스토리 변경 구간만 - LLM 호출 중에는 잡지 않는다)
+            with self._turn_lock:
+                messages = self._begin_turn(text, is_proactive=is_proactive)
             raw = self.llm.chat(messages, temperature=0.8, max_tokens=256)
-            intent, clean_text = parse_intent(raw)
-            response = self._sanitize_response(clean_text)
-            if not response:
-                response = "음, 잘 못 알아들었어요. 다시 한번 말씀해주시겠어요?"
-
-            # sleep 의도 처리
-            if intent == "sleep":
-                self.proactive.sleep_mode = True
-                self.proactive.sleep_until = datetime.now().replace(hour=8, minute=0, second=0, microsecond=0)
-
-            response_emotion = self.emotion_system.analyze_emotion(response)
-            self.conversation_history.append(
-                {
-                    "role": "assistant",
-                    "content": response,
-                    "timestamp": datetime.now().isoformat(),
-                    "emotion": response_emotion,
-                }
-            )
-
-            self.conversation_count += 1
-            self.memory.after_turn(self.conversation_history)
-
-            log.info("Agent Response (intent=%s): %s", intent, response)
-            return response, intent
+            with self._turn_lock:
+                return self._finish_turn(raw)
         except Exception as exc:
             log.error("LLM generation failed: %s", exc)
             return "죄송해요, 오류가 발생했어요.", "none"
 
-    async def _tts_gen(self, text, output_file):
-        """TTS 생성 - Edge TTS를 사용한 음성 합성"""
-        import edge_tts
-
-        communicate = edge_tts.Communicate(text, self.tts_voice)
-        await communicate.save(output_file)
+    @classmethod
+    def _pop_sentences(cls, buffer: str, min_chars: int = 6, max_chars: int = 80) -> tuple[list[str], str]:
+        """
+        스트리밍 버퍼에서 완성된 문장을 떼어낸다. Returns (sentences, rest).
+        min_chars보다 짧은 문장은 다음 문장과 합치고, 종결 부호 없이 max_chars를 넘으면 자연스러운 위치에서 자른다.
+        """
+        sentences = []
+        start = 0
+        for m in cls._SENTENCE_END_RE.finditer(buffer):
+            piece = buffer[start:m.end()].strip()
+            if len(piece) >= min_chars:
+                sentences.append(piece)
+                start = m.end()
+        rest = buffer[start:]
+        if len(rest) > max_chars:
+            idx = cls._pick_split_index(rest, max_chars // 2, max_chars)
+            piece = rest[:idx].strip()
+            if piece:
+                sentences.append(piece)
+            rest = rest[idx:]
+        return sentences, rest
+
+    def _rollback_turn(self, user_entry: dict):
+        """응답 없이 중단된 턴의 사용자 발화를 히스토리에서 제거"""
+        for i in range(len(self.conversation_history) - 1, -1, -1):
+            if self.conversation_history[i] is user_entry:
+                del self.conversation_history[i]
+                return
+
+    def stream_response(self, text: str, result: Optional[dict] = None):
+        """
+        응답을 문장 단위로 생성되는 즉시 yield (LLM 생성과 TTS 합성을 겹치기 위함).
+        마지막 문장은 _LastSentence로 감싸 내보낸다.
+        result dict에는 "first_token_sec"/"llm_sec"(LLM 지연)와 스트림 종료 시 "response"/"intent"를 채운다.
+        mode_robot 의도가 감지되면 기존처럼 응답을 읽지 않고 이후 문장 출력을 멈춘다.
+        스트림이 중단되면 사용자 발화를 히스토리에서 되돌린다.
+        """
+        if result is None:
+            result = {}
+        result.update(response="", intent="none")
+        if not self.llm:
+            result["response"] = "모델이 로드되지 않았습니다."
+            yield _LastSentence(result["response"])
+            return
 
-    def text_to_audio(self, text: str, trim_pad_ms: float = 140.0):
-        """텍스트를 오디오로 변환 - TTS 생성 및 오디오 후처리"""
-        tmp_mp3 = None
+        emitted = 0
+        user_entry = None
+        finished = False
         try:
-            import os
+            with self._turn_lock:
+                messages = self._begin_turn(text)
+                user_entry = self.conversation_history[-1]
+            raw_parts = []
+            buffer = ""
+            first_block = True
+            held = None  # 마지막 문장인지 아직 모르는 문장 (뒤에 내용이 더 오거나 스트림이 끝나면 내보냄)
+            started = time.monotonic()
+
+            def _clean(sentence: str) -> str:
+                _, sentence = parse_intent(sentence)
+                # 자기소개 제거는 응답 앞머리에만 적용
+                return self._sanitize_response(sentence, strip_intro=not emitted and held is None)
+
+            for piece in self.llm.chat_stream(messages, temperature=0.8, max_tokens=256):
+                if not raw_parts:
+                    result["first_token_sec"] = time.monotonic() - started
+                raw_parts.append(piece)
+                buffer += piece
+                if result["intent"] != "mode_robot" and "[" in buffer:
+                    if parse_intent(buffer)[0] == "mode_robot":
+                        result["intent"] = "mode_robot"
+                if result["intent"] == "mode_robot":
+                    continue  # 나머지 응답은 히스토리 기록용으로만 모은다
+                # 첫 블록은 자기소개 패턴 전체가 들어오도록 조금 더 모은 뒤 내보낸다
+                sentences, buffer = self._pop_sentences(buffer, min_chars=16 if first_block else 6)
+                first_block = first_block and not sentences
+                for sentence in sentences:
+                    cleaned = _clean(sentence)
+                    if cleaned:
+                        if held is not None:
+                            emitted += 1
+                            yield held
+                        held = cleaned
+                if held is not None and buffer.strip() and not buffer.lstrip().startswith("["):
+                    emitted += 1
+                    yield held
+                    held = None
+            result["llm_sec"] = time.monotonic() - started
+
+            if result["intent"] != "mode_robot":
+                tail = _clean(buffer)
+                if tail:
+                    if held is not None:
+                        emitted += 1
+                        yield held
+                    held = tail
+
+            with self._turn_lock:
+                response, intent = self._finish_turn("".join(raw_parts))
+            finished = True
+            result.update(response=response, intent=intent)
+            if held is not None:
+                emitted += 1
+                yield _LastSentence(held)
+            elif not emitted and intent != "mode_robot":
+                yield _LastSentence(response)
+        except Exception as exc:
+            log.error("LLM generation failed: %s", exc)
+            result.update(response="죄송해요, 오류가 발생했어요.", intent="none")
+            if not emitted:
+                yield _LastSentence(result["response"])
+        finally:
+            if not finished and user_entry is not None:
+                with self._turn_lock:
+                    self._rollback_turn(user_entry)
+
+    def _get_bg_loop(self):
+        """전용 스레드에서 도는 이벤트 루프 반환 (없으면 생성)"""
+        with self._bg_loop_lock:
+            if self._bg_loop is None or self._bg_loop.is_closed():
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever,
+                    name="agent-tts-loop",
+                    daemon=True,
+                )
+                thread.start()
+                self._bg_loop = loop
+                self._bg_thread = thread
+            return self._bg_loop
+
+    def close(self, timeout: float = 2.0):
+        """백그라운드 이벤트 루프 정지, 메모리 쓰기 마무리, 정보 서비스 정리 (서버 종료 시 호출)"""
+        self.memory.close()
+        self.info_services.close()
+        with self._bg_loop_lock:
+            loop, thread = self._bg_loop, self._bg_thread
+            self._bg_loop = None
+            self._bg_thread = None
+        if loop is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout)
+        if not loop.is_running():
+            loop.close()
+
+    def _run_async(self, coro, timeout=None):
+        """코루틴을 백그라운드 루프에서 실행하고 결과를 동기적으로 기다림"""
+        future = asyncio.run_coroutine_threadsafe(coro, self._get_bg_loop())
+        return future.result(timeout)
+
+    def warmup_tts(self):
+        """TTS 의존성 import 및 백그라운드 루프를 미리 준비 (첫 응답 지연 감소)"""
+        for mod in self._tts_missing_modules():
+            log.warning("TTS warmup: module not available: %s", mod)
+        self._get_bg_loop()
+
+    @classmethod
+    def _tts_missing_modules(cls) -> list:
+        """TTS 필수 모듈 중 없는 것 목록 - import 결과는 프로세스 수명 동안 바뀌지 않으므로 캐시"""
+        if cls._tts_missing is None:
             import importlib
-            import tempfile
 
             missing = []
-            for mod in ("numpy", "librosa", "soundfile", "edge_tts"):
+            for mod in cls._TTS_REQUIRED_MODULES:
                 try:
                     importlib.import_module(mod)
                 except ModuleNotFoundError:
                     missing.append(mod)
+            cls._tts_missing = missing
+        return cls._tts_missing
+
+    async def _tts_gen(self, text) -> bytes:
+        """TTS 생성 - Edge TTS 스트림을 메모리에 모아 MP3 바이트로 반환"""
+        import edge_tts
+
+        communicate = edge_tts.Communicate(text, self.tts_voice)
+        buf = bytearray()
+        async for chunk in communicate.stream():
+            if chunk["type"] == "audio":
+                buf.extend(chunk["data"])
+        return bytes(buf)
+
+    @staticmethod
+    def _load_mono_pcm(source, target_sr: int = 16000):
+        """
+        오디오(파일 경로 또는 file-like)를 mono float32 PCM으로 디코딩 후 target_sr로 리샘플링.
+        리샘플링은 soxr(C/SIMD 리샘플러) 사용.
+        """
+        import numpy as np
+        import soundfile as sf
+
+        pcm, sr = sf.read(source, dtype="float32", always_2d=False)
+        if pcm.ndim > 1:
+            pcm = pcm.mean(axis=1, dtype=np.float32)
+
+        if sr != target_sr and pcm.size:
+            import soxr
+
+            pcm = soxr.resample(pcm, sr, target_sr, quality="HQ")
+        return np.ascontiguousarray(pcm, dtype=np.float32), target_sr
+
+    @staticmethod
+    def _float_to_pcm16(pcm_f32):
+        """
+        float32 [-1, 1] → PCM16LE 변환.
+        scale/round/saturate를 입력 버퍼 위에서 in-place로 처리해 중간 배열 할당을 없앤다.
+        (입력 배열은 변환 후 스케일된 값으로 덮어써진다)
+        """
+        import numpy as np
+
+        np.multiply(pcm_f32, 32767.0, out=pcm_f32)
+        np.rint(pcm_f32, out=pcm_f32)
+        np.clip(pcm_f32, -32768.0, 32767.0, out=pcm_f32)
+        return pcm_f32.astype("<i2")
+
+    def text_to_audio(self, text: str, trim_pad_ms: float = 140.0):
+        """텍스트를 오디오로 변환 - 최근 합성 결과는 LRU 캐시에서 반환"""
+        key = (text, self.tts_voice, float(trim_pad_ms))
+        with self._tts_cache_lock:
+            cached = self._tts_cache.get(key)
+            if cached is not None:
+                self._tts_cache.move_to_end(key)
+                log.info("TTS cache hit: %s", text[:50])
+                return cached
+
+        audio_bytes = self._synthesize_audio(text, trim_pad_ms=trim_pad_ms)
+        if not audio_bytes or len(audio_bytes) > self.TTS_CACHE_MAX_BYTES:
+            return audio_bytes
+
+        with self._tts_cache_lock:
+            if key not in self._tts_cache:
+                self._tts_cache[key] = audio_bytes
+                self._tts_cache_bytes += len(audio_bytes)
+            self._tts_cache.move_to_end(key)
+            while (
+                len(self._tts_cache) > self.TTS_CACHE_MAX_ENTRIES
+                or self._tts_cache_bytes > self.TTS_CACHE_MAX_BYTES
+            ):
+                _, evicted = self._tts_cache.popitem(last=False)
+                self._tts_cache_bytes -= len(evicted)
+        return audio_bytes
+
+    def _synthesize_audio(self, text: str, trim_pad_ms: float = 140.0):
+        """TTS 생성 및 오디오 후처리 (캐시 미사용)"""
+        try:
+            import io
+
+            missing = self._tts_missing_modules()
             if missing:
                 log.error(
                     "TTS dependency missing: %s (install: pip install %s)",
@@ -361,7 +733,6 @@ class AgentMode:
                 return b""
 
             import numpy as np
-            import librosa
             try:
                 from .audio_processor import normalize_to_dbfs, qc, trim_energy
                 audio_proc_available = True
@@ -370,38 +741,28 @@ class AgentMode:
                 log.warning(
                     "audio_processor not found; skipping trim/normalize/qc post-processing"
                 )
-            with tempfile.NamedTemporaryFile(prefix="tts_", suffix=".mp3", delete=False) as tf:
-                tmp_mp3 = tf.name
-
             log.info("Generating TTS for: %s", text[:50])
 
-            # 이벤트 루프 설정 및 TTS 생성
-            try:
-                loop = asyncio.get_event_loop()
-                if loop.is_closed():
-                    raise RuntimeError("Event loop is closed")
-            except RuntimeError:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-
+            # TTS 생성 - 전용 백그라운드 이벤트 루프에서 실행
+            # (호출 스레드에 이미 실행 중인 루프가 있어도 안전)
             try:
-                loop.run_until_complete(self._tts_gen(text, tmp_mp3))
+                mp3_bytes = self._run_async(self._tts_gen(text))
             except Exception as exc:
                 log.error("TTS generation failed in _tts_gen: %s", exc, exc_info=True)
                 return b""
-            if not os.path.exists(tmp_mp3):
-                log.error("TTS file not created: %s", tmp_mp3)
+            if not mp3_bytes:
+                log.error("TTS returned no audio: %s", text[:50])
                 return b""
 
-            # 오디오 로드 및 리샘플링 (16kHz, mono)
-            pcm_f32, sr = librosa.load(tmp_mp3, sr=16000, mono=True)
+            # 오디오 디코딩 및 리샘플링 (16kHz, mono) - 디스크 I/O 없이 메모리에서 처리
+            pcm_f32, sr = self._load_mono_pcm(io.BytesIO(mp3_bytes), target_sr=16000)
 
             if pcm_f32.size == 0:
-                log.error("TTS audio empty after decoding: %s", tmp_mp3)
+                log.error("TTS audio empty after decoding: %s", text[:50])
                 return b""
 
             # 오디오 후처리 - DC 오프셋 제거 및 무음 구간 트림
-            pcm_f32 = (pcm_f32 - np.mean(pcm_f32)).astype(np.float32, copy=False)
+            pcm_f32 -= pcm_f32.mean(dtype=np.float64)
             if audio_proc_available:
                 # 청크형 TTS에서는 pad를 과도하게 주면 경계마다 불필요한 무음이 커진다.
                 pcm_f32 = trim_energy(
@@ -415,7 +776,7 @@ class AgentMode:
                 pcm_f32 = normalize_to_dbfs(pcm_f32, target_dbfs=-18.0, max_gain_db=18.0)
                 peak = float(np.max(np.abs(pcm_f32))) if pcm_f32.size else 0.0
                 if peak > 0.90:
-                    pcm_f32 = (pcm_f32 / peak * 0.90).astype(np.float32, copy=False)
+                    pcm_f32 *= np.float32(0.90 / peak)
 
             # 청크 경계 클릭 노이즈 완화용 짧은 페이드 인/아웃
             fade_len = int(sr * 0.008)
@@ -426,13 +787,15 @@ class AgentMode:
                     pcm_f32[:fade_len] *= fade
                     pcm_f32[-fade_len:] *= fade[::-1]
 
+            # 오디오 품질 검증 (PCM 변환이 버퍼를 in-place로 덮어쓰므로 먼저 측정)
+            if audio_proc_available:
+                rms_db, peak, clip = qc(pcm_f32)
+
             # 16-bit PCM 변환 (PCM16LE)
-            pcm_16 = (pcm_f32 * 32767.0).astype("<i2")
+            pcm_16 = self._float_to_pcm16(pcm_f32)
             audio_bytes = pcm_16.tobytes()
 
-            # 오디오 품질 검증 및 로깅
             if audio_proc_available:
-                rms_db, peak, clip = qc(pcm_f32)
                 log.info(
                     "TTS generated: %d bytes, %.2f seconds, RMS: %.2f dBFS, peak: %.3f, clip: %.2f%%",
                     len(audio_bytes),
@@ -450,14 +813,8 @@ class AgentMode:
             return audio_bytes
         except ModuleNotFoundError as exc:
             log.error("TTS dependency missing at runtime: %s", exc, exc_info=True)
-            log.error("Install: pip install edge-tts librosa soundfile")
+            log.error("Install: pip install edge-tts soundfile soxr")
             return b""
         except Exception as exc:
             log.error("TTS failed: %s", exc, exc_info=True)
             return b""
-        finally:
-            if tmp_mp3:
-                try:
-                    Path(tmp_mp3).unlink(missing_ok=True)
-                except Exception:
-                    pass
@@ -15,10 +15,13 @@ def qc(pcm_f32: np.ndarray):
     - RMS dB, 피크값, 클리핑 비율 계산
     - 음성 품질 평가를 위한 메트릭 제공
     """
-    peak = float(np.max(np.abs(pcm_f32))) if pcm_f32.size else 0.0
-    rms = float(np.sqrt(np.mean(pcm_f32**2) + 1e-12)) if pcm_f32.size else 0.0
+    if not pcm_f32.size:
+        return 20.0 * np.log10(1e-12), 0.0, float("nan")
+    mag = np.abs(pcm_f32)  # |x|는 한 번만 계산해 peak/clip에 재사용
+    peak = float(mag.max())
+    rms = float(np.sqrt(np.dot(pcm_f32, pcm_f32) / pcm_f32.size + 1e-12))
     rms_db = 20.0 * np.log10(rms + 1e-12)  # RMS를 dB로 변환
-    clip = float(np.mean(np.abs(pcm_f32) >= 0.999)) * 100.0  # 클리핑 비율 (%)
+    clip = np.count_nonzero(mag >= 0.999) / pcm_f32.size * 100.0  # 클리핑 비율 (%)
     return rms_db, peak, clip
 
 
@@ -38,12 +41,9 @@ def trim_energy(pcm: np.ndarray, sr: int, top_db: float = 35.0, pad_ms: int = 14
     if n < frame:
         return pcm.astype(np.float32, copy=False)
 
-    # 프레임별 RMS 에너지 계산
-    rms = []
-    for i in range(0, n - frame + 1, hop):
-        x = pcm[i : i + frame]
-        rms.append(np.sqrt(np.mean(x * x) + 1e-12))
-    rms = np.array(rms, dtype=np.float32)
+    # 프레임별 RMS 에너지 계산 (프레임 행렬로 한 번에)
+    frames = pcm[: (n // frame) * frame].reshape(-1, frame)
+    rms = np.sqrt(np.einsum("ij,ij->i", frames, frames) / frame + 1e-12).astype(np.float32, copy=False)
     
     # 에너지 임계값 계산 (최대값 대비 -top_db)
     thr = float(np.max(rms)) * (10 ** (-top_db / 20.0))
@@ -67,13 +67,15 @@ def normalize_to_dbfs(pcm: np.ndarray, target_dbfs: float = -22.0, max_gain_db:
     - 목표 dBFS 레벨로 오디오 볼륨 조정
     - 최대 게인 제한으로 과증폭 방지
     """
-    rms = float(np.sqrt(np.mean(pcm * pcm) + 1e-12))
+    rms = float(np.sqrt(np.dot(pcm, pcm) / max(1, pcm.size) + 1e-12))
     rms_db = 20.0 * np.log10(rms + 1e-12)
     # 필요한 게인 계산 (제한 범위 내에서)
     gain_db = np.clip(target_dbfs - rms_db, -6.0, max_gain_db)
     gain = 10 ** (gain_db / 20.0)
-    # 게인 적용 및 클리핑 방지
-    return np.clip(pcm * gain, -1.0, 1.0).astype(np.float32, copy=False)
+    # 게인 적용 및 클리핑 방지 (결과 버퍼 하나에서 in-place clip)
+    out = np.multiply(pcm, gain, dtype=np.float32)
+    np.clip(out, -1.0, 1.0, out=out)
+    return out
 
 
 def save_wav(path: str, pcm_f32: np.ndarray, sr: int):
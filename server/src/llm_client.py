@@ -1,22 +1,74 @@
-"""Ollama HTTP API 클라이언트 - 단일 LLM 인스턴스로 전체 서버에서 공유"""
+"""LLM HTTP API 클라이언트 - 단일 LLM 인스턴스로 전체 서버에서 공유
+
+- api="ollama": Ollama /api/chat (기본)
+- api="openai": OpenAI 호환 /v1/chat/completions (vLLM, SGLang, llama.cpp server 등)
+"""
 import json
 import logging
-from typing import Optional, Union
+from typing import Iterator, Optional, Union
 
 import requests
 
 
 log = logging.getLogger(__name__)
 ThinkType = Optional[Union[bool, str]]
+# 응답 형식 제약: "json" 또는 JSON 스키마 dict (서버가 디코딩 단계에서 강제)
+FormatType = Optional[Union[str, dict]]
 
 
 class LLMClient:
-    def __init__(self, base_url: str, model: str, default_think: ThinkType = False):
+    def __init__(
+        self,
+        base_url: str,
+        model: str,
+        default_think: ThinkType = False,
+        keep_alive: Optional[Union[str, int]] = None,
+        api: str = "ollama",
+        num_ctx: Optional[int] = None,
+    ):
         self.base_url = base_url.rstrip("/")
         self.model = model
         self.default_think = default_think
-        self.url = f"{self.base_url}/api/chat"
-        self.url_generate = f"{self.base_url}/api/generate"
+        # 모델을 메모리에 유지해 Ollama의 프롬프트 prefix(KV) 캐시가 턴 간에 재사용되도록 함
+        self.keep_alive = keep_alive
+        self.api = (api or "ollama").lower()
+        # 컨텍스트 길이 고정: 요청마다 값이 달라지면 Ollama가 러너를 다시 띄우고 KV 버퍼를 재할당한다
+        self.num_ctx = int(num_ctx) if num_ctx else None
+        if self.api == "openai":
+            self.url = f"{self.base_url}/v1/chat/completions"
+            self.url_generate = None
+        else:
+            self.url = f"{self.base_url}/api/chat"
+            self.url_generate = f"{self.base_url}/api/generate"
+
+    def warmup(self) -> bool:
+        """
+        모델을 미리 메모리에 올려 첫 요청의 콜드 로드 지연을 없앤다.
+        Ollama는 prompt 없는 /api/generate 호출로 모델만 로드한다.
+        """
+        if not self.url_generate:
+            return False
+        payload = {"model": self.model}
+        if self.num_ctx:
+            # 실제 요청과 같은 num_ctx로 로드해야 첫 요청에서 재로드되지 않는다
+            payload["options"] = {"num_ctx": self.num_ctx}
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+        try:
+            resp = requests.post(self.url_generate, json=payload, timeout=(5, 180))
+            resp.raise_for_status()
+            log.info("LLM model warmed up: %s", self.model)
+            return True
+        except Exception as exc:
+            log.warning("LLM warmup failed: %s", exc)
+            return False
+
+    def _options(self, temperature: float, max_tokens: int) -> dict:
+        """Ollama 생성 옵션"""
+        options = {"temperature": temperature, "num_predict": max_tokens}
+        if self.num_ctx:
+            options["num_ctx"] = self.num_ctx
+        return options
 
     def chat(
         self,
@@ -24,8 +76,10 @@ class LLMClient:
         temperature: float = 0.8,
         max_tokens: int = 256,
         think: ThinkType = None,
+        response_format: FormatType = None,
     ) -> str:
-        """ollama /api/chat 호출. messages는 [{"role": ..., "content": ...}, ...] 형식."""
+        """ollama /api/chat 호출. messages는 [{"role": ..., "content": ...}, ...] 형식.
+        response_format을 주면 서버가 출력을 해당 JSON(스키마)으로 제한한다."""
         try:
             if think is None:
                 think = self.default_think
@@ -35,6 +89,7 @@ class LLMClient:
                 temperature,
                 max_tokens,
                 think=think,
+                response_format=response_format,
             )
 
             # 모델이 길이 제한으로 끊긴 경우 한 번 더 크게 재시도
@@ -52,6 +107,7 @@ class LLMClient:
                     temperature,
                     retry_tokens,
                     think=retry_think,
+                    response_format=response_format,
                 )
                 if retry_content.strip():
                     content = retry_content
@@ -71,6 +127,7 @@ class LLMClient:
                         temperature,
                         retry_tokens,
                         think=False,
+                        response_format=response_format,
                     )
                     if retry_content.strip():
                         log.info(
@@ -81,7 +138,7 @@ class LLMClient:
                         return retry_content.strip()
 
                 log.warning("Ollama returned empty content.")
-                fallback = self._generate_fallback(messages, temperature, max_tokens)
+                fallback = self._generate_fallback(messages, temperature, max_tokens, response_format)
                 if fallback.strip():
                     log.info("Ollama chat empty -> generate fallback ok (len=%d)", len(fallback.strip()))
                     return fallback.strip()
@@ -96,24 +153,88 @@ class LLMClient:
         temperature: float,
         max_tokens: int,
         think: ThinkType = True,
+        response_format: FormatType = None,
     ) -> tuple[str, str, str]:
         """
         /api/chat 스트리밍 응답을 조합해 최종 텍스트를 반환.
         Returns:
             (content, done_reason, thinking)
         """
+        chunks = []
+        thinking_chunks = []
+        done_reason = ""
+        for piece, think_piece, reason in self._iter_chat(
+            messages, temperature, max_tokens, think=think, response_format=response_format
+        ):
+            if piece:
+                chunks.append(piece)
+            if think_piece:
+                thinking_chunks.append(think_piece)
+            if reason:
+                done_reason = reason
+        return "".join(chunks).strip(), done_reason, "".join(thinking_chunks).strip()
+
+    def chat_stream(
+        self,
+        messages: list,
+        temperature: float = 0.8,
+        max_tokens: int = 256,
+        think: ThinkType = None,
+    ) -> Iterator[str]:
+        """
+        응답 content 조각을 생성되는 대로 yield (문장 단위 TTS를 생성과 겹치기 위함).
+        content가 전혀 나오지 않으면 chat()의 재시도/폴백 결과를 한 번에 yield한다.
+        """
+        if think is None:
+            think = self.default_think
+
+        produced = False
+        try:
+            for piece, _, _ in self._iter_chat(messages, temperature, max_tokens, think=think):
+                if piece:
+                    produced = True
+                    yield piece
+        except Exception as exc:
+            log.error("LLM stream error: %s", exc)
+            return
+
+        if not produced:
+            log.warning("LLM stream returned empty content. falling back to chat().")
+            fallback = self.chat(messages, temperature=temperature, max_tokens=max_tokens, think=think)
+            if fallback:
+                yield fallback
+
+    def _iter_chat(
+        self,
+        messages: list,
+        temperature: float,
+        max_tokens: int,
+        think: ThinkType = True,
+        response_format: FormatType = None,
+    ) -> Iterator[tuple[str, str, str]]:
+        """
+        /api/chat 스트리밍 응답을 조각 단위로 yield.
+        Yields:
+            (content_piece, thinking_piece, done_reason)
+        """
+        if self.api == "openai":
+            yield from self._iter_chat_openai(
+                messages, temperature, max_tokens, think=think, response_format=response_format
+            )
+            return
+
         payload = {
             "model": self.model,
             "messages": messages,
             "stream": True,
-            "options": {"temperature": temperature, "num_predict": max_tokens},
+            "options": self._options(temperature, max_tokens),
         }
         if think is not None:
             payload["think"] = think
-
-        chunks = []
-        thinking_chunks = []
-        done_reason = ""
+        if response_format is not None:
+            payload["format"] = response_format
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
 
         with requests.post(
             self.url,
@@ -150,28 +271,100 @@ class LLMClient:
                     piece = data.get("response") or ""
                     think_piece = data.get("thinking") or ""
 
-                if piece:
-                    chunks.append(piece)
-                if think_piece:
-                    thinking_chunks.append(think_piece)
+                done = data.get("done") is True
+                done_reason = (data.get("done_reason") or "").strip().lower() if done else ""
+                if piece or think_piece or done_reason:
+                    yield piece, think_piece, done_reason
+                if done:
+                    break
+
+    def _iter_chat_openai(
+        self,
+        messages: list,
+        temperature: float,
+        max_tokens: int,
+        think: ThinkType = True,
+        response_format: FormatType = None,
+    ) -> Iterator[tuple[str, str, str]]:
+        """
+        OpenAI 호환 /v1/chat/completions SSE 스트리밍 응답을 조각 단위로 yield.
+        vLLM/SGLang 등은 서버 측 자동 prefix 캐시로 동일한 시스템 프롬프트/히스토리 prefill을 재사용한다.
+        Yields:
+            (content_piece, thinking_piece, done_reason)
+        """
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "stream": True,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        }
+        if isinstance(think, bool):
+            payload["chat_template_kwargs"] = {"enable_thinking": think}
+        if isinstance(response_format, dict):
+            payload["response_format"] = {
+                "type": "json_schema",
+                "json_schema": {"name": "response", "schema": response_format},
+            }
+        elif response_format is not None:
+            payload["response_format"] = {"type": "json_object"}
 
-                if data.get("done") is True:
-                    done_reason = (data.get("done_reason") or "").strip().lower()
+        with requests.post(
+            self.url,
+            json=payload,
+            timeout=(5, 180),
+            stream=True,
+        ) as resp:
+            resp.raise_for_status()
+            for raw_line in resp.iter_lines(decode_unicode=True):
+                if not raw_line:
+                    continue
+                line = raw_line.strip()
+                if not line.startswith("data:"):
+                    continue
+                line = line[len("data:"):].strip()
+                if line == "[DONE]":
                     break
 
-        return "".join(chunks).strip(), done_reason, "".join(thinking_chunks).strip()
+                try:
+                    data = json.loads(line)
+                except json.JSONDecodeError:
+                    log.debug("Skipping non-JSON OpenAI stream chunk: %r", line[:200])
+                    continue
+
+                if not isinstance(data, dict):
+                    continue
+                if data.get("error"):
+                    raise RuntimeError(data.get("error"))
+
+                for choice in data.get("choices") or []:
+                    delta = choice.get("delta") or {}
+                    piece = delta.get("content") or ""
+                    think_piece = delta.get("reasoning_content") or ""
+                    done_reason = str(choice.get("finish_reason") or "").strip().lower()
+                    if piece or think_piece or done_reason:
+                        yield piece, think_piece, done_reason
 
-    def _generate_fallback(self, messages: list, temperature: float, max_tokens: int) -> str:
+    def _generate_fallback(
+        self, messages: list, temperature: float, max_tokens: int, response_format: FormatType = None
+    ) -> str:
         """Fallback to /api/generate when /api/chat returns empty content."""
+        if not self.url_generate:
+            return ""
         try:
             prompt = self._messages_to_prompt(messages)
-            resp = requests.post(self.url_generate, json={
+            payload = {
                 "model": self.model,
                 "prompt": prompt,
                 "stream": False,
                 "think": False,
-                "options": {"temperature": temperature, "num_predict": max_tokens},
-            }, timeout=(5, 180))
+                "options": self._options(temperature, max_tokens),
+            }
+            if response_format is not None:
+                payload["format"] = response_format
+            if self.keep_alive is not None:
+                payload["keep_alive"] = self.keep_alive
+            resp = requests.post(self.url_generate, json=payload, timeout=(5, 180))
             resp.raise_for_status()
             data = resp.json()
             if isinstance(data, dict):
@@ -3,7 +3,10 @@
 - 컬러 콘솔 출력 및 파일 로깅 설정
 - 성능 메트릭 수집 및 통계 출력
 """
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
 from datetime import datetime
 from pathlib import Path
@@ -21,12 +24,45 @@ class ColoredFormatter(logging.Formatter):
         "RESET": "\033[0m",
     }
 
+    # 레벨별 컬러 문자열 (레코드마다 조립하지 않도록 미리 생성)
+    _COLORED = {
+        level: f"{code}{level}\033[0m" for level, code in COLORS.items() if level != "RESET"
+    }
+
     def format(self, record):
-        # 로그 레벨에 따른 컬러 적용
+        # 로그 레벨에 따른 컬러 적용 - 같은 레코드를 받는 파일 핸들러에 색상 코드가 새지 않도록 원복
         levelname = record.levelname
-        if levelname in self.COLORS:
-            record.levelname = f"{self.COLORS[levelname]}{levelname}{self.COLORS['RESET']}"
-        return super().format(record)
+        record.levelname = self._COLORED.get(levelname, levelname)
+        try:
+            return super().format(record)
+        finally:
+            record.levelname = levelname
+
+
+class _Metrics:
+    """성능 카운터 (고정 필드 - dict 대신 슬롯 속성으로 보관)"""
+
+    __slots__ = (
+        "stt_requests",
+        "stt_total_time",
+        "llm_requests",
+        "llm_total_time",
+        "tts_requests",
+        "tts_total_time",
+        "errors",
+    )
+
+    def __init__(self):
+        self.stt_requests = 0
+        self.stt_total_time = 0.0
+        self.llm_requests = 0
+        self.llm_total_time = 0.0
+        self.tts_requests = 0
+        self.tts_total_time = 0.0
+        self.errors = 0
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
 
 
 class PerformanceLogger:
@@ -34,60 +70,48 @@ class PerformanceLogger:
 
     def __init__(self):
         # 성능 메트릭 초기화
-        self.metrics = {
-            "stt_requests": 0,
-            "stt_total_time": 0.0,
-            "llm_requests": 0,
-            "llm_total_time": 0.0,
-            "tts_requests": 0,
-            "tts_total_time": 0.0,
-            "errors": 0,
-        }
+        self._m = _Metrics()
         self.log = logging.getLogger("performance")
 
+    @property
+    def metrics(self) -> dict:
+        """현재 카운터 스냅샷"""
+        return self._m.as_dict()
+
     def log_stt(self, duration: float):
-        # STT 처리 시간 기록
-        self.metrics["stt_requests"] += 1
-        self.metrics["stt_total_time"] += duration
-        avg = self.metrics["stt_total_time"] / self.metrics["stt_requests"]
-        self.log.debug("STT: %.2fs (avg: %.2fs)", duration, avg)
+        # STT 처리 시간 기록 (평균 계산/포맷팅은 DEBUG가 켜져 있을 때만)
+        m = self._m
+        m.stt_requests += 1
+        m.stt_total_time += duration
+        if self.log.isEnabledFor(logging.DEBUG):
+            self.log.debug("STT: %.2fs (avg: %.2fs)", duration, m.stt_total_time / m.stt_requests)
 
     def log_llm(self, duration: float):
         # LLM 처리 시간 기록
-        self.metrics["llm_requests"] += 1
-        self.metrics["llm_total_time"] += duration
-        avg = self.metrics["llm_total_time"] / self.metrics["llm_requests"]
-        self.log.debug("LLM: %.2fs (avg: %.2fs)", duration, avg)
+        m = self._m
+        m.llm_requests += 1
+        m.llm_total_time += duration
+        if self.log.isEnabledFor(logging.DEBUG):
+            self.log.debug("LLM: %.2fs (avg: %.2fs)", duration, m.llm_total_time / m.llm_requests)
 
     def log_tts(self, duration: float):
         # TTS 처리 시간 기록
-        self.metrics["tts_requests"] += 1
-        self.metrics["tts_total_time"] += duration
-        avg = self.metrics["tts_total_time"] / self.metrics["tts_requests"]
-        self.log.debug("TTS: %.2fs (avg: %.2fs)", duration, avg)
+        m = self._m
+        m.tts_requests += 1
+        m.tts_total_time += duration
+        if self.log.isEnabledFor(logging.DEBUG):
+            self.log.debug("TTS: %.2fs (avg: %.2fs)", duration, m.tts_total_time / m.tts_requests)
 
     def log_error(self):
         # 에러 카운트 증가
-        self.metrics["errors"] += 1
+        self._m.errors += 1
 
     def get_stats(self) -> dict:
         # 통계 데이터 계산 및 반환
-        stats = self.metrics.copy()
-        stats["stt_avg"] = (
-            stats["stt_total_time"] / stats["stt_requests"]
-            if stats["stt_requests"] > 0
-            else 0
-        )
-        stats["llm_avg"] = (
-            stats["llm_total_time"] / stats["llm_requests"]
-            if stats["llm_requests"] > 0
-            else 0
-        )
-        stats["tts_avg"] = (
-            stats["tts_total_time"] / stats["tts_requests"]
-            if stats["tts_requests"] > 0
-            else 0
-        )
+        stats = self._m.as_dict()
+        for kind in ("stt", "llm", "tts"):
+            requests = stats[f"{kind}_requests"]
+            stats[f"{kind}_avg"] = stats[f"{kind}_total_time"] / requests if requests > 0 else 0
         return stats
 
     def print_stats(self):
@@ -103,8 +127,27 @@ class PerformanceLogger:
         self.log.info("=" * 50)
 
 
+# 파일 핸들러를 구동하는 백그라운드 리스너 (setup_logging 재호출 시 교체)
+_file_listener = None
+
+
+def _stop_file_listener():
+    """파일 로그 리스너 정지 - 큐에 남은 레코드를 모두 기록한 뒤 파일을 닫는다"""
+    global _file_listener
+    if _file_listener is not None:
+        _file_listener.stop()
+        for handler in _file_listener.handlers:
+            handler.close()
+        _file_listener = None
+
+
+atexit.register(_stop_file_listener)
+
+
 def setup_logging(level: str = "INFO", save_to_file: bool = True, log_dir: str = "logs"):
     """로깅 시스템 초기화"""
+    global _file_listener
+
     # 로그 레벨 설정
     log_level = getattr(logging, level.upper(), logging.INFO)
 
@@ -115,6 +158,7 @@ def setup_logging(level: str = "INFO", save_to_file: bool = True, log_dir: str =
     # 기존 핸들러 제거
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
+    _stop_file_listener()
 
     # 로그 포맷 정의
     console_format = "%(asctime)s | %(levelname)-8s | %(name)-15s | %(message)s"
@@ -141,14 +185,20 @@ def setup_logging(level: str = "INFO", save_to_file: bool = True, log_dir: str =
         file_handler.setLevel(log_level)
         file_formatter = logging.Formatter(file_format, datefmt=date_format)
         file_handler.setFormatter(file_formatter)
-        root_logger.addHandler(file_handler)
 
         # 에러 전용 로그 파일 핸들러
         error_file = log_path / f"error_{today}.log"
         error_handler = logging.FileHandler(error_file, encoding="utf-8")
         error_handler.setLevel(logging.ERROR)
         error_handler.setFormatter(file_formatter)
-        root_logger.addHandler(error_handler)
+
+        # 파일 쓰기는 리스너 스레드가 담당 - 로그를 남기는 STT/LLM/TTS 스레드는 큐에 넣기만 한다
+        log_queue = queue.SimpleQueue()
+        _file_listener = logging.handlers.QueueListener(
+            log_queue, file_handler, error_handler, respect_handler_level=True
+        )
+        _file_listener.start()
+        root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
 
         logging.getLogger(__name__).info("Logging to: %s", log_file)
 
@@ -4,20 +4,39 @@ MemoryManager — 구조화된 md 파일 기반 메모리 시스템
 - LLM 기반 메모리 추출 (대화 → 구조화된 기억)
 - 주기적 자동 refresh
 """
+import json
 import logging
+import queue
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
+from typing import Optional
+
+from .utils import atomic_write_bytes
 
 log = logging.getLogger(__name__)
 
 # md 파일 이름 목록
 _FILES = ("Soul.md", "User.md", "Shortterm_Memory.md", "Longterm_Memory.md", "Relation.md")
+# 윈도우에서 밀려난 대화 원문 (append-only)
+_ARCHIVE_FILE = "conversation_log.jsonl"
+# 아직 채워지지 않은 항목 자리표시 (md 템플릿 공통)
+_UNKNOWN = "(아직 모름)"
+
+
+class _Append(str):
+    """writer 큐에서 덮어쓰기가 아닌 추가 쓰기를 표시 (파일 끝에 이 문자열만 기록)"""
+
+
+# 두 프롬프트 모두 고정 지시문을 앞에, 매번 바뀌는 메모리/대화를 맨 뒤에 둔다.
+# 앞부분이 호출마다 바이트 단위로 같으므로 LLM 서버(Ollama)가 그 구간의 prefix(KV) 캐시를 재사용한다.
 
 # ── LLM 메모리 추출 프롬프트 ──────────────────────────────────
 _EXTRACT_PROMPT = """\
-아래는 사용자와 AI 홈 에이전트 '콜리'의 최근 대화이다.
-대화에서 아래 카테고리에 해당하는 새로운 정보가 있으면 추출하라.
+아래에 주어지는 사용자와 AI 홈 에이전트 '콜리'의 최근 대화에서
+아래 카테고리에 해당하는 새로운 정보가 있으면 추출하라.
 정보가 없는 카테고리는 빈 칸으로 두어라. 기존 정보와 중복되면 생략하라.
 
 카테고리:
@@ -26,21 +45,18 @@ _EXTRACT_PROMPT = """\
 [LONGTERM] 장기 기억할 사항 (중요 약속, 반복 언급 주제, 사용자가 강조한 것)
 [SHORTTERM] 현재 대화 요약 (한두 문장), 사용자의 현재 기분/상태
 
+형식 — 해당 카테고리 태그 뒤에 한 줄씩 작성. 새 정보가 없으면 태그 자체를 생략.
+---
 기존 메모리:
 {existing}
 
 최근 대화:
 {conversation}
-
-형식 — 해당 카테고리 태그 뒤에 한 줄씩 작성. 새 정보가 없으면 태그 자체를 생략.
 """
 
 # ── 단기 기억 요약 프롬프트 ────────────────────────────────────
 _SUMMARIZE_SHORT_PROMPT = """\
-아래 대화 내용을 3문장 이내로 요약하라. 현재 대화 주제와 사용자의 기분/상태도 한 줄씩 적어라.
-
-대화:
-{conversation}
+아래에 주어지는 대화 내용을 3문장 이내로 요약하라. 현재 대화 주제와 사용자의 기분/상태도 한 줄씩 적어라.
 
 형식:
 ## 최근 대화 요약
@@ -51,6 +67,9 @@ _SUMMARIZE_SHORT_PROMPT = """\
 
 ## 사용자의 현재 상태/기분
 (상태)
+---
+대화:
+{conversation}
 """
 
 
@@ -71,52 +90,183 @@ class MemoryManager:
 
         # 메모리 캐시 (파일 → 내용)
         self._cache: dict[str, str] = {}
+        # 조립된 시스템 프롬프트 캐시 (soul, 나머지 메모리) - md 변경 시 무효화
+        self._prompt_parts: Optional[tuple[str, str, str]] = None
+        # 캐시 갱신·무효화와 프롬프트 재조립을 묶는 락 (refresh 스레드의 _save와 응답 스레드의 조립이 겹쳐
+        # 쓰기 전 내용으로 만든 프롬프트가 무효화 뒤에 저장되는 것을 막는다)
+        self._prompt_lock = threading.Lock()
         self._load_all()
 
+        # md 파일 쓰기는 전용 스레드가 처리 (응답 경로에서 디스크 I/O 제거)
+        self._write_queue: queue.Queue = queue.Queue(maxsize=32)
+        self._writer = threading.Thread(target=self._writer_loop, name="memory-writer", daemon=True)
+        self._writer.start()
+
+        # refresh의 요약/추출 요청을 동시에 보내는 풀 (refresh마다 새로 만들지 않고 재사용, 스레드는 첫 사용 시 생성)
+        self._refresh_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="memory-refresh")
+        # refresh는 한 번에 하나만 (직접 호출과 자동 refresh가 겹쳐 같은 md를 읽고-병합-저장하며 덮어쓰는 것 방지)
+        self._refresh_lock = threading.Lock()
+
+        # 자동 refresh는 전용 스레드가 이벤트를 기다렸다가 수행 (대기 중에는 깨어나지 않고, 응답 경로를 막지 않음)
+        self._refresh_event = threading.Event()
+        self._pending_history: Optional[list] = None
+        self._pending_lock = threading.Lock()
+        self._closing = False
+        self._refresher = threading.Thread(target=self._refresh_loop, name="memory-refresher", daemon=True)
+        self._refresher.start()
+
     # ── 파일 I/O ──────────────────────────────────────────────
 
     def _load_all(self):
         for name in _FILES:
-            path = self.memory_dir / name
-            if path.exists():
-                self._cache[name] = path.read_text(encoding="utf-8")
-            else:
+            # exists() 확인 후 다시 여는 대신 바로 읽고, 없으면 빈 내용
+            try:
+                self._cache[name] = (self.memory_dir / name).read_text(encoding="utf-8")
+            except FileNotFoundError:
                 self._cache[name] = ""
+        self._prompt_parts = None
         log.info("Memory loaded from %s (%d files)", self.memory_dir, len(self._cache))
 
     def _save(self, name: str, content: str):
-        (self.memory_dir / name).write_text(content, encoding="utf-8")
-        self._cache[name] = content
+        """캐시는 즉시 갱신하고 파일 쓰기는 백그라운드 writer에 맡긴다"""
+        with self._prompt_lock:
+            old = self._cache.get(name, "")
+            self._cache[name] = content
+            self._prompt_parts = None
+        if old and len(content) > len(old) and content.startswith(old):
+            # 기존 내용 뒤에 덧붙이기만 한 경우 파일 전체 대신 늘어난 부분만 추가 기록
+            self._write_queue.put((name, _Append(content[len(old):])))
+        else:
+            self._write_queue.put((name, content))
+
+    def archive(self, messages: list):
+        """
+        LLM 윈도우에서 밀려난 대화를 conversation_log.jsonl에 추가 (append-only 콜드 저장소).
+        최근 대화(hot)는 AgentMode 히스토리, 요약(warm)은 Shortterm_Memory.md가 담당한다.
+        """
+        lines = "".join(
+            json.dumps({k: m.get(k) for k in ("role", "content", "timestamp")}, ensure_ascii=False) + "\n"
+            for m in messages
+        )
+        if lines:
+            self._write_queue.put((_ARCHIVE_FILE, _Append(lines)))
+
+    def _writer_loop(self):
+        while True:
+            # 밀린 쓰기를 한 번에 꺼내 파일별 최신 내용만 한 번씩 기록
+            batch = [self._write_queue.get()]
+            while True:
+                try:
+                    batch.append(self._write_queue.get_nowait())
+                except queue.Empty:
+                    break
+            # 파일별 [마지막 전체 내용, 그 뒤의 추가분] (전체 쓰기가 오면 앞선 추가분은 그 안에 포함됨)
+            pending: dict[str, list] = {}
+            for item in batch:
+                if item is None:
+                    continue
+                name, content = item
+                if isinstance(content, _Append):
+                    pending.setdefault(name, [None, []])[1].append(content)
+                else:
+                    pending[name] = [content, []]
+            for name, (full, appends) in pending.items():
+                try:
+                    if full is not None:
+                        atomic_write_bytes(self.memory_dir / name, (full + "".join(appends)).encode("utf-8"))
+                    else:
+                        with open(self.memory_dir / name, "a", encoding="utf-8") as f:
+                            f.write("".join(appends))
+                except Exception as exc:
+                    log.error("Memory write failed (%s): %s", name, exc)
+            for _ in batch:
+                self._write_queue.task_done()
+            if None in batch:
+                return
+
+    def flush(self):
+        """대기 중인 파일 쓰기가 모두 끝날 때까지 대기"""
+        self._write_queue.join()
+
+    def close(self):
+        """진행 중인 refresh와 남은 쓰기를 마치고 스레드 종료 (아직 시작하지 않은 자동 refresh는 버린다)"""
+        self._closing = True
+        self._refresh_event.set()
+        self._refresher.join()
+        self._refresh_pool.shutdown(wait=True)
+        if self._writer.is_alive():
+            self._write_queue.put(None)
+            self._writer.join()
 
     # ── 시스템 프롬프트 조립 ──────────────────────────────────
 
-    def build_system_prompt(self) -> str:
-        """Soul + User + Memory 를 하나의 시스템 프롬프트로 조립"""
-        soul = self._cache.get("Soul.md", "")
-        user = self._cache.get("User.md", "")
-        short = self._cache.get("Shortterm_Memory.md", "")
-        long = self._cache.get("Longterm_Memory.md", "")
-        rel = self._cache.get("Relation.md", "")
-
-        now = datetime.now().strftime("%Y-%m-%d %H:%M (%A)")
+    def build_system_prompt(self, include_time: bool = True) -> str:
+        """Soul + User + Memory 를 하나의 시스템 프롬프트로 조립
 
+        include_time=False면 현재 시각을 생략한다. 호출자가 시각을 대화 뒤쪽에
+        따로 붙이면 시스템 프롬프트가 턴 간에 동일하게 유지되어 LLM 서버의
+        prefix(KV) 캐시가 재사용된다.
+        """
+        soul, memory, stable = self._memory_prompt_parts()
+        if not include_time:
+            # 턴마다 호출되는 경로: md 변경 전까지 같은 문자열 객체를 그대로 반환
+            return stable
         parts = [
             soul,
-            f"\n---\n현재 시각: {now}",
-            f"\n---\n{user}" if "(아직 모름)" not in user or user.count("(아직 모름)") < user.count("\n") else "",
-            f"\n---\n{rel}" if "(아직 모름)" not in rel or rel.count("(아직 모름)") < rel.count("\n") else "",
-            f"\n---\n{long}" if "축적된 기억 없음" not in long else "",
-            f"\n---\n{short}" if "대화 기록 없음" not in short else "",
+            f"\n---\n현재 시각: {self.current_time_text()}",
+            memory,
         ]
         return "\n".join(p for p in parts if p)
 
+    def _memory_prompt_parts(self) -> tuple[str, str, str]:
+        """시간 외 프롬프트 조각과 시각 없는 완성 프롬프트 (md 내용이 바뀔 때만 다시 조립)"""
+        prompt_parts = self._prompt_parts
+        if prompt_parts is not None:
+            return prompt_parts
+        with self._prompt_lock:
+            if self._prompt_parts is None:
+                user = self._cache.get("User.md", "")
+                short = self._cache.get("Shortterm_Memory.md", "")
+                long = self._cache.get("Longterm_Memory.md", "")
+                rel = self._cache.get("Relation.md", "")
+
+                parts = [
+                    f"\n---\n{user}" if user.count(_UNKNOWN) < max(user.count("\n"), 1) else "",
+                    f"\n---\n{rel}" if rel.count(_UNKNOWN) < max(rel.count("\n"), 1) else "",
+                    f"\n---\n{long}" if "축적된 기억 없음" not in long else "",
+                    f"\n---\n{short}" if "대화 기록 없음" not in short else "",
+                ]
+                soul = self._cache.get("Soul.md", "")
+                memory = "\n".join(p for p in parts if p)
+                self._prompt_parts = (soul, memory, "\n".join(p for p in (soul, memory) if p))
+            return self._prompt_parts
+
+    @staticmethod
+    def current_time_text() -> str:
+        return datetime.now().strftime("%Y-%m-%d %H:%M (%A)")
+
     # ── 대화 후 메모리 갱신 ───────────────────────────────────
 
     def after_turn(self, conversation_history: list):
-        """매 대화 턴 후 호출. refresh_interval마다 자동 갱신."""
+        """매 대화 턴 후 호출. refresh_interval마다 백그라운드 refresh를 요청하고 바로 반환."""
         self._turn_count += 1
         if self._turn_count % self.refresh_interval == 0:
-            self.refresh(conversation_history)
+            # 호출 측이 히스토리를 계속 바꾸므로 스냅샷을 넘긴다 (아직 처리 전이면 최신 것으로 교체)
+            snapshot = list(conversation_history)
+            with self._pending_lock:
+                self._pending_history = snapshot
+            self._refresh_event.set()
+
+    def _refresh_loop(self):
+        while True:
+            self._refresh_event.wait()
+            self._refresh_event.clear()
+            if self._closing:
+                return
+            with self._pending_lock:
+                history, self._pending_history = self._pending_history, None
+            if history:
+                self.refresh(history)
 
     def refresh(self, conversation_history: list):
         """LLM을 사용해 대화에서 메모리를 추출하고 md 파일에 반영"""
@@ -128,8 +278,15 @@ class MemoryManager:
                 f"{'사용자' if m['role']=='user' else '콜리'}: {m['content']}"
                 for m in recent if m.get("content")
             )
-            self._update_shortterm(conv_text)
-            self._extract_and_merge(conv_text)
+            # 두 요청을 동시에 보내 Ollama(OLLAMA_NUM_PARALLEL>1)가 한 배치로 디코딩하게 한다
+            # (두 작업이 쓰는 md 파일은 서로 겹치지 않고, 캐시 갱신은 _save가 _prompt_lock으로 묶는다)
+            with self._refresh_lock:
+                futures = [
+                    self._refresh_pool.submit(self._update_shortterm, conv_text),
+                    self._refresh_pool.submit(self._extract_and_merge, conv_text),
+                ]
+                for future in futures:
+                    future.result()
             self._last_refresh = time.time()
             log.info("Memory refreshed (turn %d)", self._turn_count)
         except Exception as exc:
@@ -191,22 +348,24 @@ class MemoryManager:
     def _merge_into_md(old_content: str, new_lines: list[str]) -> str:
         """기존 md 내용에 새 정보를 중복 없이 추가"""
         old_lower = old_content.lower()
+        seen = set()  # 같은 추출 결과 안의 중복 줄 제거 (O(1) 조회)
         additions = []
         for line in new_lines:
             # (아직 모름) 자리를 대체하거나, 중복이 아니면 추가
             core = line.lstrip("- ").strip()
-            if core.lower() not in old_lower and core:
-                additions.append(f"- {core}")
+            key = core.lower()
+            if not core or key in seen or key in old_lower:
+                continue
+            seen.add(key)
+            additions.append(f"- {core}")
 
         if not additions:
             return old_content
 
-        # "(아직 모름)" 이 있는 첫 번째 섹션 끝에 삽입
-        marker = "(아직 모름)"
-        if marker in old_content:
-            # 첫 번째 (아직 모름)을 새 정보로 교체
-            idx = old_content.index(marker)
-            return old_content[:idx] + "\n".join(additions) + old_content[idx + len(marker):]
+        # 첫 번째 (아직 모름)을 새 정보로 교체 (find 한 번으로 존재 확인과 위치를 함께 얻는다)
+        idx = old_content.find(_UNKNOWN)
+        if idx >= 0:
+            return old_content[:idx] + "\n".join(additions) + old_content[idx + len(_UNKNOWN):]
 
         # 마지막 줄 뒤에 추가
         return old_content.rstrip() + "\n" + "\n".join(additions) + "\n"
@@ -5,7 +5,6 @@
 """
 import json
 import logging
-import re
 
 from .utils import clamp
 
@@ -16,88 +15,129 @@ SERVO_MAX = 180
 DEFAULT_ANGLE_CENTER = 90
 
 
+def _build_action_schema(actions_config) -> dict:
+    """응답을 제한할 JSON 스키마: 정제된 텍스트 + 동작 (명령 목록의 action + 모드 전환/NOOP)"""
+    actions = ["SERVO_SET", "SWITCH_MODE", "NOOP"]
+    for cmd in actions_config:
+        action = cmd.get("action")
+        if action and action not in actions:
+            actions.append(action)
+    return {
+        "type": "object",
+        "properties": {
+            "refined": {"type": "string"},
+            "action": {
+                "type": "object",
+                "properties": {
+                    "action": {"type": "string", "enum": actions},
+                    "servo": {"type": "integer"},
+                    "angle": {"type": "integer", "minimum": SERVO_MIN, "maximum": SERVO_MAX},
+                    "mode": {"type": "string", "enum": ["agent", "robot"]},
+                },
+                "required": ["action"],
+            },
+        },
+        "required": ["refined", "action"],
+    }
+
+
+def _build_action_system_prompt(actions_config) -> str:
+    """음성인식 정제 + 동작 결정 시스템 프롬프트 (명령 목록만으로 정해지므로 한 번만 조립)"""
+    commands_desc = []
+    for cmd in actions_config:
+        name = cmd.get("name", "")
+        action = cmd.get("action", "")
+        keywords = cmd.get("keywords", [])
+        if keywords:
+            commands_desc.append(f"- {name}: {', '.join(keywords[:3])} -> {action}")
+    commands_text = "\n".join(commands_desc[:10])
+
+    return (
+        "당신은 로봇 제어 명령을 해석하는 AI입니다.\n"
+        "먼저 음성인식 결과의 오타나 불명확한 부분을 로봇 제어 명령어 맥락에 맞게 정제하고,\n"
+        "정제된 명령을 분석하여 적절한 동작을 JSON으로 반환하세요.\n"
+        "현재 서보 각도는 명령과 함께 주어집니다 (범위: 0-180).\n\n"
+        "사용 가능한 명령:\n"
+        f"{commands_text}\n\n"
+        "추가 의도:\n"
+        "- 사용자가 대화 모드/에이전트 모드로 전환을 원하면: {\"action\": \"SWITCH_MODE\", \"mode\": \"agent\"}\n"
+        "- 사용자가 로봇 모드로 전환을 원하면: {\"action\": \"SWITCH_MODE\", \"mode\": \"robot\"}\n\n"
+        "응답 형식 (JSON만 출력, refined에는 정제된 텍스트):\n"
+        "{\"refined\": \"...\", \"action\": {\"action\": \"SERVO_SET\", \"servo\": 0, \"angle\": 90}}\n"
+        "{\"refined\": \"...\", \"action\": {\"action\": \"SWITCH_MODE\", \"mode\": \"agent\"}}\n"
+        "{\"refined\": \"...\", \"action\": {\"action\": \"NOOP\"}}\n\n"
+        "규칙:\n"
+        "1. 상대 이동(올려/내려)은 현재 각도 기준으로 계산하여 SERVO_SET으로 반환\n"
+        "2. 불명확한 명령은 NOOP\n"
+        "3. JSON만 출력, 설명 금지"
+    )
+
+
+def _parse_reply(response: str):
+    """LLM 응답에서 JSON 객체 추출 (형식 제약을 지원하지 않는 서버/폴백 경로 대비)"""
+    try:
+        return json.loads(response)
+    except json.JSONDecodeError:
+        pass
+    # 본문 중 가장 바깥 중괄호 구간만 다시 시도
+    start, end = response.find("{"), response.rfind("}")
+    if 0 <= start < end:
+        try:
+            return json.loads(response[start:end + 1])
+        except json.JSONDecodeError:
+            pass
+    return None
+
+
 class RobotMode:
     """로봇 모드 메인 클래스 - 음성 명령을 로봇 동작으로 변환"""
     def __init__(self, actions_config, llm_client=None):
         self.actions_config = actions_config
         self.llm = llm_client
+        # 시스템 프롬프트는 명령 목록이 정해지면 고정 - 매번 같은 문자열이라 LLM 서버의 prefix(KV) 캐시가 재사용된다
+        self._action_system_prompt = _build_action_system_prompt(actions_config)
+        # 응답을 JSON 객체로 강제해 설명문/깨진 JSON 생성(→ NOOP)에 디코딩을 낭비하지 않는다
+        self._action_schema = _build_action_schema(actions_config)
 
     def process_with_llm(self, text: str, current_angle: int) -> tuple[str, dict]:
         """LLM 기반 명령 처리. Returns (refined_text, action_dict).
-        action_dict에 "action": "SWITCH_MODE" 가 포함될 수 있음."""
+        action_dict에 "action": "SWITCH_MODE" 가 포함될 수 있음.
+        음성인식 정제와 동작 결정을 한 번의 LLM 호출로 처리한다."""
         if not self.llm or not (text or "").strip():
             return text or "", {"action": "NOOP"}
 
         try:
-            refined_text = self._refine_stt(text)
-            action = self._determine_action(refined_text, current_angle)
-            return refined_text, action
+            messages = [
+                {"role": "system", "content": self._action_system_prompt},
+                # 매번 바뀌는 현재 각도는 시스템 프롬프트가 아닌 사용자 메시지에 싣는다
+                {"role": "user", "content": f"현재 서보 각도: {current_angle}도\n명령: {text}"},
+            ]
+            response = self.llm.chat(
+                messages, temperature=0.1, max_tokens=128, think=False, response_format=self._action_schema
+            )
+            reply = _parse_reply(response)
+            if not isinstance(reply, dict):
+                return text, {"action": "NOOP"}
+            return self._refined_text(text, reply.get("refined")), self._action(reply.get("action"))
         except Exception as exc:
             log.error("LLM processing failed: %s", exc)
             return text, {"action": "NOOP"}
 
-    def _refine_stt(self, text: str) -> str:
-        """음성인식 결과 정제"""
-        if not text or len(text) < 2:
+    @staticmethod
+    def _refined_text(text: str, refined) -> str:
+        """정제 결과 검증 - 너무 짧은 입력이거나 결과가 비정상이면 원문 유지"""
+        if len(text) < 2 or not isinstance(refined, str):
             return text
-
-        system_prompt = (
-            "당신은 음성인식 결과를 정제하는 전문가입니다.\n"
-            "로봇 제어 명령어 맥락을 고려하여 오타나 불명확한 부분을 수정하세요.\n"
-            "정제된 텍스트만 출력하세요. 설명 없이 결과만."
-        )
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": f"정제: {text}"},
-        ]
-        refined = self.llm.chat(messages, temperature=0.1, max_tokens=64, think=False)
+        refined = refined.strip()
         if len(refined) > len(text) * 3 or len(refined) < 1:
             return text
         return refined
 
-    def _determine_action(self, text: str, current_angle: int) -> dict:
-        """LLM 기반 동작 결정 — 로봇 명령 + 모드 전환 의도 통합 판별"""
-        commands_desc = []
-        for cmd in self.actions_config:
-            name = cmd.get("name", "")
-            action = cmd.get("action", "")
-            keywords = cmd.get("keywords", [])
-            if keywords:
-                commands_desc.append(f"- {name}: {', '.join(keywords[:3])} -> {action}")
-        commands_text = "\n".join(commands_desc[:10])
-
-        system_prompt = (
-            "당신은 로봇 제어 명령을 해석하는 AI입니다.\n"
-            "사용자의 음성 명령을 분석하여 적절한 동작을 JSON으로 반환하세요.\n\n"
-            f"현재 서보 각도: {current_angle}도 (범위: 0-180)\n\n"
-            "사용 가능한 명령:\n"
-            f"{commands_text}\n\n"
-            "추가 의도:\n"
-            "- 사용자가 대화 모드/에이전트 모드로 전환을 원하면: {\"action\": \"SWITCH_MODE\", \"mode\": \"agent\"}\n"
-            "- 사용자가 로봇 모드로 전환을 원하면: {\"action\": \"SWITCH_MODE\", \"mode\": \"robot\"}\n\n"
-            "응답 형식 (JSON만 출력):\n"
-            "{\"action\": \"SERVO_SET\", \"servo\": 0, \"angle\": 90}\n"
-            "{\"action\": \"SWITCH_MODE\", \"mode\": \"agent\"}\n"
-            "{\"action\": \"NOOP\"}\n\n"
-            "규칙:\n"
-            "1. 상대 이동(올려/내려)은 현재 각도 기준으로 계산하여 SERVO_SET으로 반환\n"
-            "2. 불명확한 명령은 NOOP\n"
-            "3. JSON만 출력, 설명 금지"
-        )
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": f"명령: {text}"},
-        ]
-        response = self.llm.chat(messages, temperature=0.1, max_tokens=128, think=False)
-
-        match = re.search(r"\{[^}]+\}", response)
-        if match:
-            try:
-                action_dict = json.loads(match.group(0))
-                if "angle" in action_dict:
-                    action_dict["angle"] = clamp(action_dict["angle"], SERVO_MIN, SERVO_MAX)
-                return action_dict
-            except json.JSONDecodeError:
-                pass
-
-        return {"action": "NOOP"}
+    @staticmethod
+    def _action(action_dict) -> dict:
+        """동작 검증 - 형식이 맞지 않으면 NOOP, 각도는 서보 범위로 제한"""
+        if not isinstance(action_dict, dict) or "action" not in action_dict:
+            return {"action": "NOOP"}
+        if "angle" in action_dict:
+            action_dict["angle"] = clamp(action_dict["angle"], SERVO_MIN, SERVO_MAX)
+        return action_dict
@@ -3,7 +3,10 @@
 - 값 범위 제한 및 텍스트 정리 함수
 - 음성 인식 결과 후처리를 위한 도구들
 """
+import os
 import re
+import tempfile
+from pathlib import Path
 
 
 def clamp(value: int, lo: int, hi: int) -> int:
@@ -14,6 +17,26 @@ def clamp(value: int, lo: int, hi: int) -> int:
     return max(lo, min(hi, value))
 
 
+def atomic_write_bytes(path, data: bytes) -> None:
+    """
+    파일 원자적 쓰기
+    - 같은 디렉토리의 임시 파일에 한 번에 쓴 뒤 os.replace로 교체
+    - 쓰는 도중 종료되어도 기존 파일이 깨지지 않음
+    """
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
 def clean_text(text: str) -> str:
     """
     음성 인식 결과 텍스트 정리 함수
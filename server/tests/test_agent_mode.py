@@ -1,11 +1,19 @@
+import threading
+from collections import OrderedDict
+
 import numpy as np
 
-from src.agent_mode import AgentMode
+from src.agent_mode import AgentMode, _LastSentence
 
 
 def _make_agent():
     agent = AgentMode.__new__(AgentMode)
     agent._get_assistant_settings = lambda: ("아이", "cheerful")
+    agent.tts_voice = "ko-KR-SunHiNeural"
+    agent._tts_cache = OrderedDict()
+    agent._tts_cache_bytes = 0
+    agent._tts_cache_lock = threading.Lock()
+    agent._turn_lock = threading.Lock()
     return agent
 
 
@@ -50,6 +58,16 @@ def test_merge_audio_chunks_applies_crossfade():
     assert len(merged) == expected_samples * 2
 
 
+def test_merge_audio_chunks_saturates_instead_of_wrapping():
+    loud = (np.ones(1600, dtype=np.int16) * 32767).tobytes()
+
+    merged = np.frombuffer(AgentMode.merge_audio_chunks([loud, loud], sr=16000, crossfade_ms=10.0), dtype="<i2")
+
+    # 경계 구간에서 반올림 오차로 32767을 넘어도 음수로 뒤집히지 않아야 한다.
+    assert merged.min() > 32000
+    assert merged.max() == 32767
+
+
 def test_crossfade_audio_boundaries_keeps_chunked_structure():
     chunk1 = (np.ones(1600, dtype=np.int16) * 1200).tobytes()
     chunk2 = (np.ones(1600, dtype=np.int16) * -1200).tobytes()
@@ -65,3 +83,409 @@ def test_crossfade_audio_boundaries_keeps_chunked_structure():
     # boundary 2개 × 160 samples가 전체에서 줄어든다.
     total_samples = sum(len(c) for c in crossed) // 2
     assert total_samples == (1600 * 3 - 160 * 2)
+
+
+def test_load_mono_pcm_downmixes_and_resamples(tmp_path):
+    import soundfile as sf
+
+    sr = 24000
+    t = np.linspace(0, 0.5, int(sr * 0.5), endpoint=False)
+    tone = (0.2 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+    path = tmp_path / "tone.wav"
+    sf.write(str(path), np.stack([tone, tone], axis=1), sr)
+
+    pcm, out_sr = AgentMode._load_mono_pcm(str(path), target_sr=16000)
+
+    assert out_sr == 16000
+    assert pcm.ndim == 1
+    assert pcm.dtype == np.float32
+    assert abs(pcm.size - 8000) <= 2
+
+
+def test_text_to_audio_decodes_in_memory_bytes(tmp_path, monkeypatch):
+    import io
+
+    import soundfile as sf
+
+    sr = 24000
+    t = np.linspace(0, 0.5, int(sr * 0.5), endpoint=False)
+    tone = (0.2 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+    buf = io.BytesIO()
+    sf.write(buf, tone, sr, format="WAV")
+    encoded = buf.getvalue()
+
+    agent = _make_agent()
+
+    async def fake_tts_gen(text):
+        return encoded
+
+    agent._tts_gen = fake_tts_gen
+    monkeypatch.chdir(tmp_path)
+
+    audio = agent.text_to_audio("안녕")
+
+    assert len(audio) > 0
+    assert len(audio) % 2 == 0
+    # 임시 파일을 남기지 않는다.
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_text_to_audio_caches_recent_results():
+    agent = _make_agent()
+    calls = []
+
+    def fake_synthesize(text, trim_pad_ms=140.0):
+        calls.append(text)
+        return text.encode("utf-8") * 2
+
+    agent._synthesize_audio = fake_synthesize
+    agent.TTS_CACHE_MAX_ENTRIES = 2
+
+    assert agent.text_to_audio("가") == "가".encode("utf-8") * 2
+    agent.text_to_audio("가")
+    assert calls == ["가"]
+
+    # 다른 pad/목소리는 별도 항목
+    agent.text_to_audio("가", trim_pad_ms=40.0)
+    assert calls == ["가", "가"]
+
+    # 한도를 넘으면 가장 오래된 항목부터 제거
+    agent.text_to_audio("나")
+    agent.text_to_audio("가")
+    assert calls == ["가", "가", "나", "가"]
+    assert len(agent._tts_cache) == 2
+
+
+def test_text_to_audio_does_not_cache_failures():
+    agent = _make_agent()
+    calls = []
+
+    def fake_synthesize(text, trim_pad_ms=140.0):
+        calls.append(text)
+        return b""
+
+    agent._synthesize_audio = fake_synthesize
+    agent.text_to_audio("가")
+    agent.text_to_audio("가")
+    assert calls == ["가", "가"]
+    assert agent._tts_cache_bytes == 0
+
+
+def test_float_to_pcm16_scales_and_saturates():
+    pcm = np.array([0.0, 0.5, -0.5, 1.0, -1.0, 1.5, -1.5], dtype=np.float32)
+
+    pcm16 = AgentMode._float_to_pcm16(pcm)
+
+    assert pcm16.dtype == np.dtype("<i2")
+    assert pcm16.tolist() == [0, 16384, -16384, 32767, -32767, 32767, -32768]
+
+
+class _FakeMemory:
+    def __init__(self):
+        self.archived = []
+
+    def archive(self, messages):
+        self.archived.extend(messages)
+
+    def build_system_prompt(self, include_time=True):
+        return "SYSTEM" + (" 12:00" if include_time else "")
+
+    @staticmethod
+    def current_time_text():
+        return "2026-01-01 12:00 (Thursday)"
+
+
+def _make_history_agent(turns):
+    agent = _make_agent()
+    agent.memory = _FakeMemory()
+    agent.max_history = 4
+    agent._history_start = 0
+    agent.conversation_history = []
+    for i in range(turns):
+        agent.conversation_history.append({"role": "user", "content": f"u{i}"})
+        agent.conversation_history.append({"role": "assistant", "content": f"a{i}"})
+    return agent
+
+
+def test_build_messages_keeps_volatile_context_last():
+    agent = _make_history_agent(1)
+    agent.conversation_history.append({"role": "user", "content": "u1"})
+
+    messages = agent._build_messages("날씨 맑음")
+
+    assert messages[0] == {"role": "system", "content": "SYSTEM"}
+    assert [m["content"] for m in messages[1:-1]] == ["u0", "a0", "u1"]
+    assert messages[-1]["role"] == "system"
+    assert "현재 시각" in messages[-1]["content"]
+    assert "날씨 맑음" in messages[-1]["content"]
+
+
+def test_history_window_keeps_prefix_stable_between_trims():
+    agent = _make_history_agent(2)
+    agent.conversation_history.append({"role": "user", "content": "u2"})
+
+    first = agent._history_window()
+    assert first[0]["content"] == "u2"
+
+    agent.conversation_history.append({"role": "assistant", "content": "a2"})
+    agent.conversation_history.append({"role": "user", "content": "u3"})
+    second = agent._history_window()
+
+    # 윈도우 시작점이 그대로라서 이전 턴의 프롬프트가 다음 턴의 prefix가 된다.
+    assert second[: len(first)] == first
+    assert second[0]["role"] == "user"
+
+
+def test_iter_tts_audio_yields_before_all_chunks_are_synthesized():
+    agent = _make_agent()
+    release_last = threading.Event()
+
+    def fake_text_to_audio(text, trim_pad_ms=140.0):
+        if text == "c":
+            assert release_last.wait(5)
+        return (np.ones(1600, dtype=np.int16) * 1000).tobytes()
+
+    agent.text_to_audio = fake_text_to_audio
+    stream = agent.iter_tts_audio(["a", "b", "c"], sr=16000, crossfade_ms=10.0)
+
+    # 마지막 청크 합성이 끝나지 않아도 첫 청크는 나온다.
+    first = next(stream)
+    assert len(first) == 1600 * 2
+
+    release_last.set()
+    rest = list(stream)
+    total_samples = (len(first) + sum(len(c) for c in rest)) // 2
+    assert total_samples == 1600 * 3 - 160 * 2
+
+
+def test_iter_tts_audio_synthesizes_chunks_concurrently_in_order():
+    agent = _make_agent()
+    barrier = threading.Barrier(3, timeout=5)
+
+    def fake_text_to_audio(text, trim_pad_ms=140.0):
+        barrier.wait()  # 세 청크가 동시에 합성 중이어야 통과
+        value = {"a": 1000, "b": 2000, "c": 3000}[text]
+        return (np.ones(1600, dtype=np.int16) * value).tobytes()
+
+    agent.text_to_audio = fake_text_to_audio
+    chunks = list(agent.iter_tts_audio(["a", "b", "c"], sr=16000, crossfade_ms=0.0))
+
+    values = [int(np.frombuffer(c, dtype=np.int16)[0]) for c in chunks]
+    assert values == [1000, 2000, 3000]
+
+
+def test_run_async_works_inside_running_event_loop():
+    import asyncio
+
+    agent = _make_agent()
+
+    async def _coro():
+        await asyncio.sleep(0)
+        return "ok"
+
+    async def _outer():
+        # 호출 스레드의 루프가 이미 실행 중이어도 run_until_complete 오류가 나지 않아야 한다.
+        return agent._run_async(_coro(), timeout=5)
+
+    assert asyncio.run(_outer()) == "ok"
+    assert agent._run_async(_coro(), timeout=5) == "ok"
+
+
+def test_close_stops_background_loop():
+    from types import SimpleNamespace
+
+    agent = _make_agent()
+    agent.memory = SimpleNamespace(close=lambda: None)
+    agent.info_services = SimpleNamespace(close=lambda: None)
+    loop = agent._get_bg_loop()
+    thread = agent._bg_thread
+    assert thread.is_alive()
+
+    agent.close()
+
+    assert not thread.is_alive()
+    assert loop.is_closed()
+    # 닫은 뒤에도 다음 호출 시 새 루프가 생성된다.
+    assert agent._get_bg_loop() is not loop
+    agent.close()
+
+
+def test_pop_sentences_splits_on_terminal_punctuation():
+    sentences, rest = AgentMode._pop_sentences("좋아요. 오늘은 맑아요! 내일은", min_chars=4)
+    assert sentences == ["좋아요.", "오늘은 맑아요!"]
+    assert rest == "내일은"
+
+    # 짧은 문장은 다음 문장과 합쳐진다.
+    sentences, rest = AgentMode._pop_sentences("네. 알겠어요. ", min_chars=6)
+    assert sentences == ["네. 알겠어요."]
+    assert rest == ""
+
+    # 숫자의 소수점은 경계가 아니다.
+    sentences, rest = AgentMode._pop_sentences("기온은 3.5도예요", min_chars=4)
+    assert sentences == []
+
+
+def test_stream_response_yields_sentences_before_stream_ends():
+    from types import SimpleNamespace
+
+    agent = _make_history_agent(0)
+    after_turn = []
+    agent.memory.after_turn = after_turn.append
+    agent.proactive = SimpleNamespace(update_interaction=lambda: None, sleep_mode=False, sleep_until=None)
+    agent.info_services = SimpleNamespace(process_info_request=lambda text: None)
+    agent.scheduler = SimpleNamespace(process_schedule_request=lambda text: None)
+    agent.emotion_system = SimpleNamespace(analyze_emotion=lambda text: "neutral")
+    agent.conversation_count = 0
+
+    produced = []
+
+    def fake_chat_stream(messages, temperature=0.8, max_tokens=256):
+        for piece in ["안녕하세요! 저는 콜리입니다! ", "오늘 ", "날씨가 좋아요. ", "산책 어때요? ", "[INTENT:sleep]"]:
+            produced.append(piece)
+            yield piece
+
+    agent.llm = SimpleNamespace(chat_stream=fake_chat_stream)
+    turn = {}
+    stream = agent.stream_response("안녕", turn)
+
+    first = next(stream)
+    assert first == "오늘 날씨가 좋아요."
+    # 첫 문장은 LLM 스트림이 끝나기 전에 나온다.
+    assert len(produced) < 5
+
+    rest = list(stream)
+    assert rest == ["산책 어때요?"]
+    assert isinstance(rest[-1], _LastSentence)
+    assert not isinstance(first, _LastSentence)
+    assert turn["response"] == "오늘 날씨가 좋아요. 산책 어때요?"
+    assert turn["intent"] == "sleep"
+    assert turn["first_token_sec"] <= turn["llm_sec"]
+    assert agent.proactive.sleep_mode is True
+    assert agent.conversation_history[-1]["content"] == turn["response"]
+    assert len(after_turn) == 1
+    assert all(isinstance(m["timestamp"], int) for m in agent.conversation_history)
+
+
+def _make_stream_agent(pieces):
+    from types import SimpleNamespace
+
+    agent = _make_history_agent(0)
+    agent.memory.after_turn = lambda history: None
+    agent.proactive = SimpleNamespace(update_interaction=lambda: None, sleep_mode=False, sleep_until=None)
+    agent.info_services = SimpleNamespace(process_info_request=lambda text: None)
+    agent.scheduler = SimpleNamespace(process_schedule_request=lambda text: None)
+    agent.emotion_system = SimpleNamespace(analyze_emotion=lambda text: "neutral")
+    agent.conversation_count = 0
+    agent.llm = SimpleNamespace(chat_stream=lambda messages, temperature=0.8, max_tokens=256: iter(pieces))
+    return agent
+
+
+def test_stream_response_does_not_speak_mode_robot_reply():
+    agent = _make_stream_agent(["[INTENT:mode_robot] ", "로봇 모드로 ", "바꿀게요."])
+    turn = {}
+
+    assert list(agent.stream_response("로봇 모드", turn)) == []
+    assert turn["intent"] == "mode_robot"
+    assert agent.conversation_history[-1]["content"] == "로봇 모드로 바꿀게요."
+
+
+def test_stream_response_rolls_back_user_turn_when_aborted():
+    agent = _make_stream_agent(["오늘은 날씨가 좋아요. ", "산책 어때요? ", "우산은 필요 없어요."])
+    stream = agent.stream_response("안녕", {})
+
+    assert next(stream).startswith("오늘은 날씨가 좋아요.")
+    stream.close()
+
+    assert agent.conversation_history == []
+
+
+def test_iter_tts_audio_pads_last_sentence_of_text_stream():
+    agent = _make_agent()
+    pads = []
+
+    def fake_text_to_audio(text, trim_pad_ms=140.0):
+        pads.append((text, trim_pad_ms))
+        return (np.ones(1600, dtype=np.int16) * 1000).tobytes()
+
+    agent.text_to_audio = fake_text_to_audio
+    list(agent.iter_tts_audio(iter(["a", "b", _LastSentence("c")]), sr=16000, crossfade_ms=0.0))
+    list(agent.iter_tts_audio(iter([_LastSentence("d")]), sr=16000, crossfade_ms=0.0))
+
+    assert pads == [("a", 80.0), ("b", 40.0), ("c", 80.0), ("d", 140.0)]
+    assert all(type(text) is str for text, _ in pads)
+
+
+def test_iter_tts_audio_consumes_text_stream_incrementally():
+    agent = _make_agent()
+    more_text = threading.Event()
+
+    def text_stream():
+        yield "a"
+        assert more_text.wait(5)
+        yield "b"
+
+    agent.text_to_audio = lambda text, trim_pad_ms=140.0: (np.ones(1600, dtype=np.int16) * 1000).tobytes()
+    stream = agent.iter_tts_audio(text_stream(), sr=16000, crossfade_ms=0.0)
+
+    # 두 번째 문장이 생성되기 전에 첫 오디오가 나온다.
+    first = next(stream)
+    assert len(first) == 1600 * 2
+
+    more_text.set()
+    assert len(list(stream)) == 1
+
+
+def test_trim_history_bounds_growth_and_keeps_window():
+    agent = _make_history_agent(0)
+    agent.max_history = 20
+    for i in range(200):
+        agent.conversation_history.append({"role": "user", "content": f"u{i}"})
+        window = agent._history_window()
+        agent.conversation_history.append({"role": "assistant", "content": f"a{i}"})
+        agent._trim_history()
+
+        assert len(agent.conversation_history) <= 40
+        # 잘라낸 뒤에도 윈도우 시작점은 같은 메시지를 가리킨다.
+        assert agent.conversation_history[agent._history_start] == window[0]
+
+    assert agent.conversation_history[-1]["content"] == "a199"
+    # 잘라낸 대화는 순서대로 보관되어 빠짐없이 이어진다.
+    assert agent.memory.archived + agent.conversation_history == [
+        {"role": role, "content": f"{role[0]}{i}"} for i in range(200) for role in ("user", "assistant")
+    ]
+
+
+def test_tts_dependency_probe_runs_once(monkeypatch):
+    import importlib
+
+    calls = []
+    real_import = importlib.import_module
+
+    def counting_import(name, *args, **kwargs):
+        calls.append(name)
+        return real_import(name, *args, **kwargs)
+
+    monkeypatch.setattr(AgentMode, "_tts_missing", None)
+    monkeypatch.setattr(AgentMode, "_TTS_REQUIRED_MODULES", ("numpy", "no_such_tts_module"))
+    monkeypatch.setattr(importlib, "import_module", counting_import)
+
+    assert AgentMode._tts_missing_modules() == ["no_such_tts_module"]
+    assert AgentMode._tts_missing_modules() == ["no_such_tts_module"]
+    assert calls == ["numpy", "no_such_tts_module"]
+
+
+def test_generate_response_does_not_hold_turn_lock_during_llm_call():
+    from types import SimpleNamespace
+
+    agent = _make_stream_agent([])
+    lock_held = []
+
+    def fake_chat(messages, temperature=0.8, max_tokens=256):
+        lock_held.append(agent._turn_lock.locked())
+        return "좋은 아침이에요."
+
+    agent.llm = SimpleNamespace(chat=fake_chat)
+
+    assert agent.generate_response("안녕") == ("좋은 아침이에요.", "none")
+    assert lock_held == [False]
+    assert [m["role"] for m in agent.conversation_history] == ["user", "assistant"]
@@ -16,3 +16,17 @@ def test_qc_and_normalize():
     normalized = audio_processor.normalize_to_dbfs(pcm, target_dbfs=-22.0)
     new_rms_db, _, _ = audio_processor.qc(normalized)
     assert new_rms_db > rms_db
+
+
+def test_trim_energy_cuts_leading_and_trailing_silence():
+    sr = 16000
+    silence = np.zeros(sr // 2, dtype=np.float32)
+    t = np.linspace(0, 0.5, sr // 2, endpoint=False)
+    tone = (0.3 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+    pcm = np.concatenate((silence, tone, silence))
+
+    trimmed = audio_processor.trim_energy(pcm, sr=sr, top_db=35.0, pad_ms=100)
+
+    pad = int(sr * 0.1)
+    assert trimmed.dtype == np.float32
+    assert abs(trimmed.size - (tone.size + 2 * pad)) <= int(sr * 0.02)
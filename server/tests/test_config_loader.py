@@ -0,0 +1,154 @@
+from config_loader import Config
+
+
+def test_yaml_overrides_merge_into_defaults_and_save_round_trips(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "config.yaml"
+    path.write_text("llm:\n  model: qwen3:8b\nassistant:\n  name: 콜리\n", encoding="utf-8")
+
+    config = Config(str(path))
+
+    assert config.get("llm", "model") == "qwen3:8b"
+    assert config.get("llm", "base_url") == "http://localhost:11434"
+    assert config.get("assistant", "name") == "콜리"
+
+    saved = tmp_path / "saved.yaml"
+    config.save(str(saved))
+    assert "콜리" in saved.read_text(encoding="utf-8")
+    assert Config(str(saved)).config == config.config
+
+
+def test_unchanged_yaml_is_parsed_once(tmp_path, monkeypatch):
+    import os
+
+    import config_loader
+
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "config.yaml"
+    path.write_text("server:\n  port: 6000\n", encoding="utf-8")
+
+    loads = []
+    real_load = config_loader.yaml.load
+
+    def counting_load(*args, **kwargs):
+        loads.append(1)
+        return real_load(*args, **kwargs)
+
+    monkeypatch.setattr(config_loader.yaml, "load", counting_load)
+
+    first = Config(str(path))
+    first.config["server"]["port"] = 1
+    second = Config(str(path))
+    assert len(loads) == 1
+    # 캐시된 파싱 결과가 인스턴스 간에 공유되지 않는다.
+    assert second.get("server", "port") == 6000
+
+    path.write_text("server:\n  port: 7000\n", encoding="utf-8")
+    os.utime(path, ns=(0, 1))
+    assert Config(str(path)).get("server", "port") == 7000
+    assert len(loads) == 2
+
+
+def test_merge_config_handles_nested_overrides():
+    config = Config.__new__(Config)
+    config._get_cache = {}
+    config._section_views = {}
+    base = {"a": {"b": {"c": 1, "d": 2}, "e": 3}, "f": {"g": 4}}
+
+    config._merge_config(base, {"a": {"b": {"c": 10}, "e": {"x": 1}}, "f": 5, "h": 6})
+
+    assert base == {"a": {"b": {"c": 10, "d": 2}, "e": {"x": 1}}, "f": 5, "h": 6}
+
+
+def test_env_overrides_are_applied_with_types(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("SERVER_PORT", "6123")
+    monkeypatch.setenv("ASSISTANT_NAME", "콜리")
+    monkeypatch.delenv("DEVICE", raising=False)
+
+    config = Config(str(tmp_path / "missing.yaml"))
+
+    assert config.get("server", "port") == 6123
+    assert config.get("assistant", "name") == "콜리"
+    assert config.get("stt", "device") == "cuda"
+
+
+def test_dotenv_is_loaded_once_per_process(tmp_path, monkeypatch):
+    import config_loader
+
+    calls = []
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(config_loader, "_load_dotenv", lambda: calls.append(1))
+    monkeypatch.setattr(config_loader, "_dotenv_loaded", False)
+
+    Config(str(tmp_path / "missing.yaml"))
+    Config(str(tmp_path / "missing.yaml"))
+
+    assert calls == [1]
+
+
+def test_overrides_do_not_leak_into_class_defaults(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "config.yaml"
+    path.write_text("server:\n  port: 6001\n", encoding="utf-8")
+
+    Config(str(path))
+
+    assert Config.DEFAULT_CONFIG["server"]["port"] == 5001
+    assert Config(str(tmp_path / "missing.yaml")).get("server", "port") == 5001
+
+
+def test_get_caches_lookups_and_invalidates_on_write(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    config = Config(str(tmp_path / "missing.yaml"))
+
+    assert config.get("llm", "model") == "qwen2.5:0.5b"
+    assert config.get("llm", "missing", default="x") == "x"
+    assert ("llm", "model") in config._get_cache
+
+    config._set_path(("llm", "model"), "qwen3:8b")
+    assert config.get("llm", "model") == "qwen3:8b"
+
+
+def test_sections_are_exposed_as_read_only_views(tmp_path, monkeypatch):
+    import pytest
+
+    monkeypatch.chdir(tmp_path)
+    config = Config(str(tmp_path / "missing.yaml"))
+
+    assert config.server["port"] == 5001
+    assert config.server is config.server
+    with pytest.raises(TypeError):
+        config.server["port"] = 1
+    with pytest.raises(AttributeError):
+        config.no_such_section
+
+    config._set_path(("server", "port"), 6002)
+    assert config.server["port"] == 6002
+
+
+def test_get_config_builds_singleton_once_under_concurrency(tmp_path, monkeypatch):
+    import threading
+    import time
+
+    import config_loader
+
+    built = []
+
+    class _SlowConfig:
+        def __init__(self, config_file):
+            built.append(config_file)
+            time.sleep(0.05)
+
+    monkeypatch.setattr(config_loader, "Config", _SlowConfig)
+    monkeypatch.setattr(config_loader, "_config", None)
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(config_loader.get_config())) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(built) == 1
+    assert all(r is results[0] for r in results)
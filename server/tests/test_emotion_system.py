@@ -0,0 +1,83 @@
+from emotion_system import EmotionSystem
+
+
+def _reference_scores(text):
+    scores = {emotion: 0 for emotion in EmotionSystem.EMOTIONS}
+    for emotion, keywords in EmotionSystem.EMOTION_KEYWORDS.items():
+        for keyword in keywords:
+            if keyword in text:
+                scores[emotion] += 1
+    return scores
+
+
+def test_analyze_emotion_matches_per_keyword_scan():
+    samples = [
+        "오늘 정말 행복하고 기쁘다",
+        "너무 답답하고 속상해",
+        "와 대박 완전 멋지다",
+        "피곤해서 잠 좀 자고 싶어",
+        "그냥 그래",
+    ]
+    for text in samples:
+        system = EmotionSystem()
+        scores = _reference_scores(text)
+        best = max(scores.values())
+        expected = max(scores, key=scores.get) if best else "neutral"
+        assert system.analyze_emotion(text) == expected, text
+
+
+def test_shared_keyword_scores_every_owner():
+    system = EmotionSystem()
+    # "답답"은 sad/angry 양쪽 키워드 - 동점이면 EMOTIONS 순서상 앞선 sad
+    assert system.analyze_emotion("답답해") == "sad"
+    assert system.analyze_emotion("답답하고 짜증나") == "angry"
+
+
+def test_latin_keywords_match_case_insensitively():
+    from emotion_system import _compile_keyword_scan
+
+    owners, pattern = _compile_keyword_scan({"happy": ["Good"], "sad": ["bad"]})
+
+    assert {m.casefold() for m in pattern.findall("GOOD or BAD")} == {"good", "bad"}
+    assert owners == {"good": ["happy"], "bad": ["sad"]}
+
+
+def test_emotion_command_is_cached_and_returned_as_a_copy():
+    system = EmotionSystem()
+
+    command = system.get_emotion_command("happy")
+
+    assert command == {
+        "action": "EMOTION",
+        "emotion": "happy",
+        "led": {"pattern": "pulse", "speed": "medium", "color": {"r": 255, "g": 200, "b": 0}},
+        "servo_action": "NOD",
+    }
+    # 캐시된 명령은 사본으로 나가므로 호출자가 바꿔도 다음 명령에 새지 않는다.
+    command["led"]["color"]["r"] = 0
+    command["servo_action"] = "SHAKE"
+    assert EmotionSystem().get_emotion_command("happy")["led"]["color"]["r"] == 255
+    assert EmotionSystem().get_emotion_command("happy")["servo_action"] == "NOD"
+    # 알 수 없는 감정은 neutral 표현으로 대체하되 캐시에 남기지 않는다.
+    assert system.get_emotion_command("bored")["led"]["pattern"] == "solid"
+    assert "bored" not in EmotionSystem._EMOTION_COMMANDS
+
+
+def test_emotion_history_keeps_most_recent_entries():
+    system = EmotionSystem()
+    for i in range(25):
+        system.set_emotion("happy" if i % 2 else "sad")
+
+    assert len(system.emotion_history) == system.max_history
+    assert list(system.emotion_history)[-1] == "happy"
+
+
+def test_random_emotion_excludes_current():
+    system = EmotionSystem()
+    system.set_emotion("sad")
+
+    picks = {system.get_random_emotion() for _ in range(200)}
+
+    assert "sad" not in picks
+    assert picks <= set(EmotionSystem.EMOTIONS)
+    assert system.get_random_emotion(exclude_current=False) in EmotionSystem.EMOTIONS
@@ -0,0 +1,196 @@
+from info_services import InfoServices
+
+
+class _WeatherResponse:
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {
+            "name": "Seoul",
+            "weather": [{"description": "맑음"}],
+            "main": {"temp": 21.0, "feels_like": 20.5, "humidity": 40},
+            "wind": {"speed": 1.2},
+        }
+
+
+class _FakeSession:
+    def __init__(self, response):
+        self.response = response
+        self.calls = []
+
+    def get(self, url, **kwargs):
+        self.calls.append((url, kwargs))
+        return self.response
+
+
+def test_get_weather_reuses_result_within_ttl(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr("info_services.time.monotonic", lambda: clock[0])
+
+    services = InfoServices(weather_api_key="key")
+    services._http = _FakeSession(_WeatherResponse())
+    calls = services._http.calls
+    first = services.get_weather()
+    clock[0] += 299
+    assert services.get_weather() is first
+    assert len(calls) == 1
+
+    clock[0] += 2
+    services.get_weather()
+    assert len(calls) == 2
+    assert first["description"] == "맑음"
+
+
+def test_check_timers_pops_only_expired_in_deadline_order(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr("info_services.time.monotonic", lambda: clock[0])
+    monkeypatch.setattr("info_services.time.time", lambda: clock[0] + 1_700_000_000.0)
+
+    services = InfoServices()
+    services.set_timer(300, "라면")
+    services.set_timer(60, "차")
+    services.set_timer(60, "계란")
+
+    assert services.check_timers() == []
+    clock[0] += 60
+    assert [t["label"] for t in services.check_timers()] == ["차", "계란"]
+    assert services.get_active_timers()["timers"] == [{"label": "라면", "remaining_sec": 240}]
+
+    clock[0] += 240
+    expired = services.check_timers()
+    # end_time은 monotonic 값이 아니라 wall-clock epoch로 나간다
+    assert expired == [{"id": 0, "label": "라면", "end_time": 1_700_001_300.0, "duration": 300}]
+    assert services.timers == []
+
+
+def test_http_session_is_created_once_and_reused():
+    services = InfoServices()
+
+    session = services._http_session()
+
+    assert services._http_session() is session
+    assert session.get_adapter("https://news.naver.com").poolmanager is not None
+
+
+class _RssResponse:
+    def __init__(self, status_code, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        pass
+
+
+def test_news_uses_conditional_get_and_reuses_titles_on_304():
+    rss = (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+        "<item><title>첫 소식</title></item><item><title>둘째 소식</title></item>"
+        "</channel></rss>"
+    ).encode("utf-8")
+    services = InfoServices()
+    session = _FakeSession(_RssResponse(200, rss, {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}))
+    services._http = session
+
+    first = services.get_news_headlines(count=1)
+    assert first == {"type": "news", "headlines": ["첫 소식"]}
+    assert session.calls[0][1]["headers"] == {}
+
+    session.response = _RssResponse(304)
+    second = services.get_news_headlines(count=2)
+    assert second == {"type": "news", "headlines": ["첫 소식", "둘째 소식"]}
+    assert session.calls[1][1]["headers"] == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+    }
+
+
+def test_process_info_request_sets_timer_from_minutes_and_seconds():
+    services = InfoServices()
+
+    result = services.process_info_request("타이머 2분 30초 맞춰줘")
+
+    assert result == {"type": "timer_set", "label": "타이머 1", "duration_sec": 150}
+
+
+def test_process_info_request_routes_by_keyword(monkeypatch):
+    services = InfoServices()
+    monkeypatch.setattr(services, "get_weather", lambda: {"type": "weather"})
+    monkeypatch.setattr(services, "get_news_headlines", lambda: {"type": "news"})
+    services.set_timer(60)
+
+    cases = {
+        "지금 몇 시야": "time",
+        "오늘 며칠이야": "date",
+        "무슨 요일이야": "weekday",
+        "내일 비 와?": "weather",
+        "뉴스들 알려줘": "news",
+        "타이머 2분 30초 맞춰줘": "timer_set",
+        "타이머 맞춰줘": "timer_error",
+        "타이머 얼마 남았어": "timers",
+        "타이머 취소해줘": "timers_cancelled",
+        "알람 시간 바꿔줘": None,
+    }
+    for text, expected in cases.items():
+        result = services.process_info_request(text)
+        assert (result or {}).get("type") == expected, text
+
+
+def test_check_alarms_triggers_due_alarms_once():
+    from datetime import datetime, timedelta
+    from info_services import _Alarm
+
+    services = InfoServices()
+    now = datetime.now()
+    past, later = now - timedelta(minutes=1), now + timedelta(days=1)
+    services.alarms = [
+        _Alarm(0, "지난", past, past.hour, past.minute),
+        _Alarm(1, "내일", later, later.hour, later.minute),
+    ]
+
+    assert [a["label"] for a in services.check_alarms()] == ["지난"]
+    assert [a.label for a in services.alarms] == ["내일"]
+    assert services.check_alarms() == []
+
+
+def test_parse_rss_titles_stops_after_limit():
+    from info_services import _parse_rss_titles
+
+    items = "".join(f"<item><title> 소식 {i} </title><description>본문</description></item>" for i in range(30))
+    rss = f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>피드</title>{items}</channel></rss>'
+
+    assert _parse_rss_titles(rss.encode("utf-8"), 3) == ["소식 0", "소식 1", "소식 2"]
+
+
+def test_briefing_fetches_weather_and_news_concurrently(monkeypatch):
+    import threading
+
+    services = InfoServices(weather_api_key="key")
+    barrier = threading.Barrier(2, timeout=2)
+
+    def fake_weather():
+        barrier.wait()
+        return {"type": "weather"}
+
+    def fake_news(count=3):
+        barrier.wait()
+        return {"type": "news", "headlines": ["소식"]}
+
+    monkeypatch.setattr(services, "get_weather", fake_weather)
+    monkeypatch.setattr(services, "get_news_headlines", fake_news)
+
+    result = services.process_info_request("오늘 브리핑 해줘")
+
+    assert result["type"] == "briefing"
+    assert result["weather"] == {"type": "weather"}
+    assert result["news"]["headlines"] == ["소식"]
+    assert result["time"]["type"] == "time"
+
+    # 두 번째 브리핑은 같은 워커를 재사용한다
+    pool = services._briefing_pool
+    services.process_info_request("오늘 브리핑 해줘")
+    assert services._briefing_pool is pool
+
+    services.close()
+    assert pool._shutdown
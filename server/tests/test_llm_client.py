@@ -50,7 +50,7 @@ def test_chat_once_merges_stream_chunks(monkeypatch):
 def test_chat_retries_once_when_done_reason_is_length(monkeypatch):
     calls = []
 
-    def fake_chat_once(messages, temperature, max_tokens, think=True):
+    def fake_chat_once(messages, temperature, max_tokens, think=True, response_format=None):
         calls.append((max_tokens, think))
         if len(calls) == 1:
             return "안녕하세요. 밤", "length", "생각 중"
@@ -88,7 +88,7 @@ def test_chat_uses_generate_fallback_when_stream_is_empty(monkeypatch):
 def test_chat_retries_with_think_false_when_content_empty_but_thinking_exists(monkeypatch):
     calls = []
 
-    def fake_chat_once(messages, temperature, max_tokens, think=True):
+    def fake_chat_once(messages, temperature, max_tokens, think=True, response_format=None):
         calls.append((max_tokens, think))
         if len(calls) == 1:
             return "", "stop", "긴 추론 텍스트"
@@ -113,7 +113,7 @@ def test_chat_retries_with_think_false_when_content_empty_but_thinking_exists(mo
 def test_chat_uses_client_default_think(monkeypatch):
     calls = []
 
-    def fake_chat_once(messages, temperature, max_tokens, think=True):
+    def fake_chat_once(messages, temperature, max_tokens, think=True, response_format=None):
         calls.append((max_tokens, think))
         return "응답", "stop", ""
 
@@ -128,3 +128,139 @@ def test_chat_uses_client_default_think(monkeypatch):
 
     assert result == "응답"
     assert calls == [(128, False)]
+
+
+def test_chat_once_sends_keep_alive(monkeypatch):
+    captured = {}
+
+    def fake_post(*args, **kwargs):
+        captured.update(kwargs["json"])
+        return _StreamResponse(['{"message":{"content":"응답"},"done":true,"done_reason":"stop"}'])
+
+    monkeypatch.setattr("src.llm_client.requests.post", fake_post)
+
+    client = LLMClient("http://localhost:11434", "qwen3:8b", keep_alive="30m")
+    client._chat_once([{"role": "user", "content": "질문"}], 0.8, 64)
+
+    assert captured["keep_alive"] == "30m"
+    assert "num_ctx" not in captured["options"]
+
+
+def test_fixed_num_ctx_is_sent_with_chat_and_warmup(monkeypatch):
+    captured = []
+
+    def fake_post(url, **kwargs):
+        captured.append(kwargs["json"])
+        if url.endswith("/api/generate"):
+            return type("_Resp", (), {"raise_for_status": lambda self: None})()
+        return _StreamResponse(['{"message":{"content":"응답"},"done":true,"done_reason":"stop"}'])
+
+    monkeypatch.setattr("src.llm_client.requests.post", fake_post)
+
+    client = LLMClient("http://localhost:11434", "qwen3:8b", num_ctx=4096)
+    client.warmup()
+    client._chat_once([{"role": "user", "content": "질문"}], 0.8, 64)
+
+    # 워밍업과 실제 요청이 같은 컨텍스트 길이를 써야 모델이 다시 로드되지 않는다.
+    assert captured[0]["options"] == {"num_ctx": 4096}
+    assert captured[1]["options"]["num_ctx"] == 4096
+
+
+def test_chat_once_openai_merges_sse_chunks(monkeypatch):
+    lines = [
+        'data: {"choices":[{"delta":{"role":"assistant"}}]}',
+        'data: {"choices":[{"delta":{"content":"안녕"}}]}',
+        "",
+        'data: {"choices":[{"delta":{"content":"하세요."},"finish_reason":"stop"}]}',
+        "data: [DONE]",
+    ]
+    captured = {}
+
+    def fake_post(url, **kwargs):
+        captured["url"] = url
+        captured.update(kwargs["json"])
+        return _StreamResponse(lines)
+
+    monkeypatch.setattr("src.llm_client.requests.post", fake_post)
+
+    client = LLMClient("http://localhost:8000", "Qwen/Qwen2.5-0.5B-Instruct", api="openai")
+    content, done_reason, thinking = client._chat_once(
+        messages=[{"role": "user", "content": "인사해줘"}],
+        temperature=0.8,
+        max_tokens=64,
+        think=False,
+    )
+
+    assert captured["url"] == "http://localhost:8000/v1/chat/completions"
+    assert captured["max_tokens"] == 64
+    assert content == "안녕하세요."
+    assert done_reason == "stop"
+    assert thinking == ""
+
+
+def test_warmup_loads_model_without_prompt(monkeypatch):
+    captured = {}
+
+    class _Resp:
+        def raise_for_status(self):
+            pass
+
+    def fake_post(url, **kwargs):
+        captured["url"] = url
+        captured["json"] = kwargs["json"]
+        return _Resp()
+
+    monkeypatch.setattr("src.llm_client.requests.post", fake_post)
+
+    client = LLMClient("http://localhost:11434", "qwen3:8b", keep_alive="30m")
+    assert client.warmup() is True
+    assert captured["url"] == "http://localhost:11434/api/generate"
+    assert captured["json"] == {"model": "qwen3:8b", "keep_alive": "30m"}
+
+
+def test_chat_stream_yields_pieces_as_they_arrive(monkeypatch):
+    lines = [
+        '{"message":{"content":"안녕"},"done":false}',
+        '{"message":{"content":"하세요."},"done":false}',
+        '{"message":{"content":""},"done":true,"done_reason":"stop"}',
+    ]
+    monkeypatch.setattr("src.llm_client.requests.post", lambda *a, **k: _StreamResponse(lines))
+
+    client = LLMClient("http://localhost:11434", "qwen3:8b")
+    pieces = list(client.chat_stream([{"role": "user", "content": "인사해줘"}]))
+
+    assert pieces == ["안녕", "하세요."]
+
+
+def test_chat_stream_falls_back_to_chat_when_empty(monkeypatch):
+    lines = ['{"message":{"content":""},"done":true,"done_reason":"stop"}']
+    monkeypatch.setattr("src.llm_client.requests.post", lambda *a, **k: _StreamResponse(lines))
+
+    client = LLMClient("http://localhost:11434", "qwen3:8b")
+    monkeypatch.setattr(client, "chat", lambda *args, **kwargs: "대체 응답")
+
+    assert list(client.chat_stream([{"role": "user", "content": "안녕"}])) == ["대체 응답"]
+
+
+def test_response_format_is_sent_to_ollama_and_openai(monkeypatch):
+    captured = []
+
+    def fake_post(url, **kwargs):
+        captured.append(kwargs["json"])
+        if "/v1/" in url:
+            return _StreamResponse(['data: {"choices":[{"delta":{"content":"{}"},"finish_reason":"stop"}]}'])
+        return _StreamResponse(['{"message":{"content":"{}"},"done":true,"done_reason":"stop"}'])
+
+    monkeypatch.setattr("src.llm_client.requests.post", fake_post)
+    schema = {"type": "object", "properties": {"action": {"type": "string"}}, "required": ["action"]}
+
+    LLMClient("http://localhost:11434", "qwen3:8b").chat([{"role": "user", "content": "질문"}], response_format=schema)
+    LLMClient("http://localhost:8000", "qwen3:8b", api="openai").chat(
+        [{"role": "user", "content": "질문"}], response_format=schema
+    )
+
+    assert captured[0]["format"] == schema
+    assert captured[1]["response_format"] == {
+        "type": "json_schema",
+        "json_schema": {"name": "response", "schema": schema},
+    }
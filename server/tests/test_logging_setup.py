@@ -0,0 +1,52 @@
+import logging
+
+from src import logging_setup
+
+
+def test_file_logging_goes_through_background_listener(tmp_path):
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    try:
+        logging_setup.setup_logging("INFO", save_to_file=True, log_dir=str(tmp_path))
+        assert any(isinstance(h, logging.handlers.QueueHandler) for h in root.handlers)
+        assert not any(isinstance(h, logging.FileHandler) for h in root.handlers)
+
+        logging.getLogger("test").info("큐 경유 기록")
+        logging.getLogger("test").error("에러 기록")
+        logging_setup._stop_file_listener()
+
+        app_log = next(tmp_path.glob("app_*.log")).read_text(encoding="utf-8")
+        error_log = next(tmp_path.glob("error_*.log")).read_text(encoding="utf-8")
+        assert "큐 경유 기록" in app_log and "에러 기록" in app_log
+        assert "에러 기록" in error_log and "큐 경유 기록" not in error_log
+    finally:
+        logging_setup._stop_file_listener()
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+        for handler in saved_handlers:
+            root.addHandler(handler)
+        root.setLevel(saved_level)
+
+
+def test_performance_logger_stats():
+    perf = logging_setup.PerformanceLogger()
+    perf.log_stt(0.5)
+    perf.log_stt(1.5)
+    perf.log_llm(2.0)
+    perf.log_error()
+
+    stats = perf.get_stats()
+
+    assert stats["stt_requests"] == 2 and stats["stt_avg"] == 1.0
+    assert stats["llm_avg"] == 2.0
+    assert stats["tts_requests"] == 0 and stats["tts_avg"] == 0
+    assert stats["errors"] == 1
+    assert perf.metrics["stt_total_time"] == 2.0
+
+
+def test_colored_formatter_does_not_leak_colors_into_record():
+    formatter = logging_setup.ColoredFormatter("%(levelname)s %(message)s")
+    record = logging.LogRecord("t", logging.WARNING, __file__, 1, "조심", None, None)
+
+    assert formatter.format(record) == "\033[33mWARNING\033[0m 조심"
+    assert record.levelname == "WARNING"
@@ -0,0 +1,250 @@
+from src.memory_manager import MemoryManager
+
+
+def _make_manager(tmp_path):
+    files = {
+        "Soul.md": "# Soul",
+        "User.md": "# User\n- 이름: 민수\n",
+        "Relation.md": "# Relation\n(아직 모름)",
+        "Longterm_Memory.md": "# Longterm\n축적된 기억 없음",
+        "Shortterm_Memory.md": "# Shortterm\n대화 기록 없음",
+    }
+    for name, content in files.items():
+        (tmp_path / name).write_text(content, encoding="utf-8")
+    return MemoryManager(llm_client=None, memory_dir=str(tmp_path))
+
+
+def test_build_system_prompt_with_and_without_time(tmp_path):
+    manager = _make_manager(tmp_path)
+
+    without_time = manager.build_system_prompt(include_time=False)
+    with_time = manager.build_system_prompt()
+
+    assert without_time == "# Soul\n\n---\n# User\n- 이름: 민수\n"
+    assert with_time.startswith("# Soul\n\n---\n현재 시각: ")
+    assert with_time.endswith("\n\n---\n# User\n- 이름: 민수\n")
+
+
+def test_build_system_prompt_reflects_saved_memory(tmp_path):
+    manager = _make_manager(tmp_path)
+    before = manager.build_system_prompt(include_time=False)
+
+    manager._save("Longterm_Memory.md", "# Longterm\n- 생일은 5월")
+    after = manager.build_system_prompt(include_time=False)
+
+    assert after != before
+    assert after.endswith("\n\n---\n# Longterm\n- 생일은 5월")
+
+
+def test_save_during_prompt_rebuild_is_not_lost(tmp_path):
+    import threading
+
+    manager = _make_manager(tmp_path)
+    saver = threading.Thread(target=manager._save, args=("User.md", "# User\n- 이름: 지수\n"))
+
+    class _Cache(dict):
+        def get(self, key, default=None):
+            value = super().get(key, default)
+            if key == "User.md" and not saver.is_alive() and saver.ident is None:
+                # 조립 도중 다른 스레드가 저장한다
+                saver.start()
+                saver.join(timeout=0.2)
+            return value
+
+    manager._cache = _Cache(manager._cache)
+    manager.build_system_prompt(include_time=False)
+    saver.join()
+
+    assert "지수" in manager.build_system_prompt(include_time=False)
+
+
+def test_refresh_issues_memory_requests_concurrently(tmp_path):
+    import threading
+
+    barrier = threading.Barrier(2, timeout=5)
+
+    class _FakeLLM:
+        def chat(self, messages, temperature=0.8, max_tokens=256, think=None):
+            barrier.wait()  # 두 요청이 동시에 진행 중이어야 통과
+            if "요약" in messages[0]["content"]:
+                return "## 최근 대화 요약\n날씨 이야기"
+            return "[USER]\n- 취미: 등산"
+
+    manager = _make_manager(tmp_path)
+    manager.llm = _FakeLLM()
+
+    manager.refresh([{"role": "user", "content": "주말에 등산 가"}])
+    manager.flush()
+
+    assert "날씨 이야기" in (tmp_path / "Shortterm_Memory.md").read_text(encoding="utf-8")
+    assert "취미: 등산" in (tmp_path / "User.md").read_text(encoding="utf-8")
+
+
+def test_save_updates_cache_immediately_and_writes_in_background(tmp_path):
+    manager = _make_manager(tmp_path)
+
+    manager._save("User.md", "# User\n- 이름: 지수\n")
+    assert "지수" in manager.build_system_prompt(include_time=False)
+
+    manager.close()
+    assert (tmp_path / "User.md").read_text(encoding="utf-8") == "# User\n- 이름: 지수\n"
+
+
+def test_pending_writes_keep_only_latest_content(tmp_path):
+    manager = _make_manager(tmp_path)
+
+    for i in range(10):
+        manager._save("Longterm_Memory.md", f"# Longterm\n- 기억 {i}")
+    manager.flush()
+
+    assert (tmp_path / "Longterm_Memory.md").read_text(encoding="utf-8") == "# Longterm\n- 기억 9"
+    # 임시 파일이 남지 않는다.
+    assert not [p for p in tmp_path.iterdir() if p.name.endswith(".tmp")]
+
+
+def test_stable_system_prompt_is_reused_until_memory_changes(tmp_path):
+    manager = _make_manager(tmp_path)
+
+    first = manager.build_system_prompt(include_time=False)
+    assert manager.build_system_prompt(include_time=False) is first
+
+    manager._save("User.md", "# User\n- 이름: 지수\n")
+    assert manager.build_system_prompt(include_time=False) is not first
+
+
+def test_merge_into_md_skips_existing_and_repeated_lines():
+    old = "# User\n- 이름: 민수\n"
+
+    merged = MemoryManager._merge_into_md(old, ["- 이름: 민수", "- 취미: 등산", "취미: 등산", "- 직업: 학생"])
+
+    assert merged == "# User\n- 이름: 민수\n- 취미: 등산\n- 직업: 학생\n"
+
+
+def test_archive_appends_jsonl(tmp_path):
+    import json
+
+    manager = _make_manager(tmp_path)
+    manager.archive([{"role": "user", "content": "안녕", "timestamp": "t1", "emotion": "happy"}])
+    manager.archive([{"role": "assistant", "content": "반가워요", "timestamp": "t2"}])
+    manager.close()
+
+    lines = (tmp_path / "conversation_log.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"role": "user", "content": "안녕", "timestamp": "t1"},
+        {"role": "assistant", "content": "반가워요", "timestamp": "t2"},
+    ]
+
+
+def test_memory_prompts_keep_instructions_before_dynamic_text():
+    from src.memory_manager import _EXTRACT_PROMPT, _SUMMARIZE_SHORT_PROMPT
+
+    # 고정 지시문이 앞에 오고 바뀌는 부분은 맨 뒤에 와야 LLM 서버의 prefix 캐시가 맞는다
+    for template in (_EXTRACT_PROMPT, _SUMMARIZE_SHORT_PROMPT):
+        static, _, dynamic = template.partition("---\n")
+        assert "{" not in static
+        assert dynamic.rstrip().endswith("{conversation}")
+
+
+def test_save_appends_only_the_new_tail(tmp_path, monkeypatch):
+    import src.memory_manager as memory_manager
+
+    full_writes = []
+    real_write = memory_manager.atomic_write_bytes
+    monkeypatch.setattr(
+        memory_manager, "atomic_write_bytes",
+        lambda path, data: (full_writes.append(path.name), real_write(path, data)),
+    )
+    manager = _make_manager(tmp_path)
+
+    manager._save("User.md", "# User\n- 이름: 민수\n- 취미: 등산\n")
+    manager.flush()
+    assert full_writes == []
+
+    manager._save("User.md", "# User\n- 이름: 지수\n")
+    manager._save("User.md", "# User\n- 이름: 지수\n- 직업: 학생\n")
+    manager.close()
+    assert full_writes == ["User.md"]
+    assert (tmp_path / "User.md").read_text(encoding="utf-8") == "# User\n- 이름: 지수\n- 직업: 학생\n"
+
+
+def test_merge_into_md_fills_first_placeholder():
+    old = "# Relation\n## 가족\n(아직 모름)\n## 친구\n(아직 모름)\n"
+
+    merged = MemoryManager._merge_into_md(old, ["- 동생: 지호"])
+
+    assert merged == "# Relation\n## 가족\n- 동생: 지호\n## 친구\n(아직 모름)\n"
+
+
+def test_after_turn_refreshes_in_background(tmp_path):
+    import threading
+
+    release = threading.Event()
+    done = threading.Event()
+    seen = []
+
+    class _FakeLLM:
+        def chat(self, messages, temperature=0.8, max_tokens=256, think=None):
+            release.wait(timeout=5)
+            seen.append(messages[1]["content"])
+            if len(seen) == 2:
+                done.set()
+            return ""
+
+    manager = _make_manager(tmp_path)
+    manager.llm = _FakeLLM()
+    manager.refresh_interval = 2
+    history = [{"role": "user", "content": "등산 가자"}]
+
+    manager.after_turn(history)
+    manager.after_turn(history)  # 두 번째 턴에서 refresh 요청 - LLM이 멈춰 있어도 바로 반환
+    history.append({"role": "user", "content": "나중에 추가된 말"})
+    release.set()
+
+    assert done.wait(timeout=5)
+    assert all("등산 가자" in prompt and "나중에 추가된 말" not in prompt for prompt in seen)
+    manager.close()
+
+
+def test_concurrent_refreshes_do_not_overlap(tmp_path):
+    import threading
+    import time
+
+    active = []
+    overlaps = []
+    lock = threading.Lock()
+
+    class _FakeLLM:
+        def chat(self, messages, temperature=0.8, max_tokens=256, think=None):
+            if "추출" in messages[0]["content"]:
+                with lock:
+                    active.append(1)
+                    overlaps.append(len(active))
+                time.sleep(0.05)
+                with lock:
+                    active.pop()
+                return "[USER]\n- 취미: 등산\n[RELATION]\n-\n[LONGTERM]\n-"
+            return ""
+
+    manager = _make_manager(tmp_path)
+    manager.llm = _FakeLLM()
+    history = [{"role": "user", "content": "등산 가자"}]
+
+    threads = [threading.Thread(target=manager.refresh, args=(history,)) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=5)
+
+    assert overlaps == [1, 1, 1]
+    assert manager._cache["User.md"].count("취미: 등산") == 1
+    manager.close()
+
+
+def test_missing_memory_files_load_as_empty(tmp_path):
+    (tmp_path / "Soul.md").write_text("# Soul", encoding="utf-8")
+
+    manager = MemoryManager(llm_client=None, memory_dir=str(tmp_path))
+
+    assert manager._cache["Soul.md"] == "# Soul"
+    assert manager._cache["User.md"] == manager._cache["Relation.md"] == ""
+    manager.close()
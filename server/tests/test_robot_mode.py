@@ -0,0 +1,69 @@
+from src.robot_mode import RobotMode
+
+
+class _FakeLLM:
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.calls = []
+        self.formats = []
+
+    def chat(self, messages, temperature=0.8, max_tokens=256, think=None, response_format=None):
+        self.calls.append(messages)
+        self.formats.append(response_format)
+        return self.replies.pop(0)
+
+
+_COMMANDS = [{"name": "left", "keywords": ["왼쪽", "좌측"], "action": "SERVO_SET", "servo": 0, "angle": 30}]
+
+
+def test_system_prompt_is_identical_across_angles():
+    reply = '{"refined": "왼쪽", "action": {"action": "NOOP"}}'
+    llm = _FakeLLM([reply, reply])
+    robot = RobotMode(_COMMANDS, llm)
+
+    robot.process_with_llm("왼쪽", 90)
+    robot.process_with_llm("왼쪽", 120)
+
+    first, second = llm.calls
+    assert first[0]["content"] is second[0]["content"]
+    assert "- left: 왼쪽, 좌측 -> SERVO_SET" in first[0]["content"]
+    assert first[1]["content"] == "현재 서보 각도: 90도\n명령: 왼쪽"
+    assert second[1]["content"] == "현재 서보 각도: 120도\n명령: 왼쪽"
+
+
+def test_refine_and_action_come_from_one_call():
+    llm = _FakeLLM(['{"refined": "왼쪽으로 돌려", "action": {"action": "SERVO_SET", "servo": 0, "angle": 30}}'])
+    robot = RobotMode(_COMMANDS, llm)
+
+    assert robot.process_with_llm("왼쪽으로 돌료", 90) == (
+        "왼쪽으로 돌려",
+        {"action": "SERVO_SET", "servo": 0, "angle": 30},
+    )
+    assert len(llm.calls) == 1
+
+
+def test_action_is_clamped_and_bad_replies_fall_back():
+    llm = _FakeLLM([
+        '결과: {"refined": "끝까지 올려", "action": {"action": "SERVO_SET", "servo": 0, "angle": 250}}',
+        "모르겠어요",
+        '{"refined": "' + "아주 긴 설명" * 10 + '", "action": {"servo": 0}}',
+    ])
+    robot = RobotMode(_COMMANDS, llm)
+
+    assert robot.process_with_llm("끝까지 올려", 90) == (
+        "끝까지 올려",
+        {"action": "SERVO_SET", "servo": 0, "angle": 180},
+    )
+    assert robot.process_with_llm("음", 90) == ("음", {"action": "NOOP"})
+    assert robot.process_with_llm("올려", 90) == ("올려", {"action": "NOOP"})
+
+
+def test_reply_is_constrained_by_schema():
+    llm = _FakeLLM(['{"refined": "대화 모드로 바꿔", "action": {"action": "SWITCH_MODE", "mode": "agent"}}'])
+    robot = RobotMode(_COMMANDS + [{"name": "stop", "keywords": ["멈춰"], "action": "STOP"}], llm)
+
+    _, action = robot.process_with_llm("대화 모드로 바꿔", 90)
+    assert action == {"action": "SWITCH_MODE", "mode": "agent"}
+    schema = llm.formats[0]
+    assert schema["required"] == ["refined", "action"]
+    assert schema["properties"]["action"]["properties"]["action"]["enum"] == ["SERVO_SET", "SWITCH_MODE", "NOOP", "STOP"]
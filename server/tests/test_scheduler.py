@@ -0,0 +1,56 @@
+from scheduler import Scheduler
+
+
+def test_process_schedule_request_adds_schedule(tmp_path):
+    scheduler = Scheduler(schedule_file=str(tmp_path / "schedules.json"))
+
+    response = scheduler.process_schedule_request("내일 오후 3시 회의 있어")
+
+    assert response and "등록했습니다" in response
+    assert len(scheduler.schedules) == 1
+    assert scheduler.schedules[0]["title"] == "회의"
+
+
+def test_process_schedule_request_ignores_unrelated_text(tmp_path):
+    scheduler = Scheduler(schedule_file=str(tmp_path / "schedules.json"))
+
+    assert scheduler.process_schedule_request("고마워 콜리") is None
+    assert scheduler.schedules == []
+
+
+def test_schedules_round_trip_through_file(tmp_path):
+    path = tmp_path / "schedules.json"
+    scheduler = Scheduler(schedule_file=str(path))
+    scheduler.process_schedule_request("내일 오후 3시 병원 가야 해")
+
+    reloaded = Scheduler(schedule_file=str(path))
+
+    assert reloaded.schedules == scheduler.schedules
+    # 한글은 이스케이프 없이 저장된다.
+    assert "병원" in path.read_text(encoding="utf-8")
+
+
+def test_parse_and_add_schedule_extracts_date_time_and_title(tmp_path):
+    from datetime import datetime, timedelta
+
+    scheduler = Scheduler(schedule_file=str(tmp_path / "schedules.json"))
+
+    scheduler.parse_and_add_schedule("모레 오전 10시 30분 치과 가야해")
+
+    item = scheduler.schedules[0]
+    when = datetime.fromisoformat(item["datetime"])
+    assert item["title"] == "치과"
+    assert (when.hour, when.minute) == (10, 30)
+    assert when.date() == (datetime.now() + timedelta(days=2)).date()
+
+
+def test_parse_and_add_schedule_prefers_nearer_date_keyword(tmp_path):
+    from datetime import datetime, timedelta
+
+    scheduler = Scheduler(schedule_file=str(tmp_path / "schedules.json"))
+
+    # 먼저 언급된 키워드가 아니라 오늘 > 내일 > 모레 순서로 날짜를 정한다
+    scheduler.parse_and_add_schedule("모레 말고 내일 오후 3시 회의")
+
+    when = datetime.fromisoformat(scheduler.schedules[0]["datetime"])
+    assert when.date() == (datetime.now() + timedelta(days=1)).date()